@@ -1,14 +1,101 @@
 import streamlit as st
 import pandas as pd
 from utils.pdf_reader import read_pdf
-from parser.resume_parser import ResumeParser
-from ranker.candidate_ranker import CandidateRanker
-from utils.skill_extractor import extract_skills_from_jd
-import tempfile
-import os
+from parser.resume_parser import ResumeParser, get_lean_nlp
+from ranker.candidate_ranker import CandidateRanker, KeywordRanker
+from utils.skill_extractor import extract_skills_from_jd, SKILL_DB
+from utils.model_registry import warm_up
+from utils.resume_cache import ResumeCache
+from utils import instrumentation
 import re
 
 st.set_page_config(layout="wide")
+
+
+@st.cache_resource(show_spinner="Loading NLP models...")
+def load_models():
+    """Loads the models once per server process and keeps them warm across reruns."""
+    return {**warm_up(load_spacy=False), 'nlp': get_lean_nlp()}
+
+
+st.sidebar.header("Ranking Mode")
+ranking_mode = st.sidebar.radio(
+    "Choose how candidates are ranked:",
+    ("Hybrid (keyword + semantic)", "Keyword only (fast)"),
+    help="Keyword only skips the NLP models entirely: regex-based parsing and keyword scores, for quick triage."
+)
+keyword_only = ranking_mode == "Keyword only (fast)"
+
+# Keyword-only sessions never load (or even import) the models
+if not keyword_only:
+    load_models()
+
+
+@st.cache_resource
+def get_resume_cache():
+    """One on-disk cache of parsed resumes and embeddings shared by all sessions."""
+    return ResumeCache()
+
+
+@st.cache_data(show_spinner=False)
+def read_jd_pdf(pdf_bytes):
+    """Reads an uploaded JD once instead of on every rerun."""
+    return read_pdf(pdf_bytes)
+
+
+def build_candidates(uploaded_files, candidate_keys, ranker, keyword_only=False):
+    """
+    Returns the candidate rows for the uploads, in upload order.
+
+    Parsed resumes and their embeddings stay in session state, keyed by the
+    upload's content hash, so each file is only processed the first time it is
+    seen (or loaded from the on-disk cache). Unreadable files are remembered and skipped.
+    With `keyword_only`, resumes are parsed with regexes only and never embedded or cached.
+    """
+    cache = get_resume_cache()
+    pool = st.session_state.setdefault('resume_pool_keyword' if keyword_only else 'resume_pool', {})
+
+    to_embed = []
+    for uploaded_file, (cache_key, _) in zip(uploaded_files, candidate_keys):
+        if cache_key in pool:
+            continue
+        hit = None if keyword_only else cache.get(cache_key)
+        if hit is not None and hit[0] is not None:
+            pool[cache_key] = {**hit[0], 'resume_embedding': hit[1]}
+            if hit[1] is None:
+                to_embed.append(cache_key)
+            continue
+
+        # Read straight from the upload's bytes; nothing is written to disk
+        resume_text = read_pdf(uploaded_file.getvalue())
+        if not resume_text:
+            pool[cache_key] = None
+            continue
+        parser = ResumeParser(resume_text, lean=True, regex_only=keyword_only)
+        pool[cache_key] = {**parser.get_details(), 'resume_embedding': None}
+        if not keyword_only:
+            to_embed.append(cache_key)
+
+    if to_embed:
+        embeddings = ranker.encode_resumes([pool[key]['resume_text'] for key in to_embed])
+        for key, embedding in zip(to_embed, embeddings):
+            pool[key]['resume_embedding'] = embedding
+        cache.put_many(
+            (key, {k: v for k, v in pool[key].items() if k != 'resume_embedding'}, pool[key]['resume_embedding'])
+            for key in to_embed
+        )
+
+    # Forget resumes that are no longer uploaded
+    current = {cache_key for cache_key, _ in candidate_keys}
+    for key in [key for key in pool if key not in current]:
+        del pool[key]
+
+    return [
+        {**pool[cache_key], 'filename': filename}
+        for cache_key, filename in candidate_keys if pool[cache_key] is not None
+    ]
+
+
 st.title("👨‍💼 Intelligent Resume Scanner")
 
 st.sidebar.header("Instructions")
@@ -28,10 +115,7 @@ else:
     jd_upload = st.file_uploader("Upload Job Description (PDF only)", type="pdf")
     if jd_upload:
         with st.spinner("Reading Job Description PDF..."):
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmpfile:
-                tmpfile.write(jd_upload.getvalue())
-                jd_text = read_pdf(tmpfile.name)
-            os.remove(tmpfile.name)
+            jd_text = read_jd_pdf(jd_upload.getvalue())
 
 # --- Resume Input ---
 st.header("2. Upload Resumes")
@@ -46,41 +130,79 @@ if st.button("Rank Candidates"):
         st.error("Please upload at least one resume.")
     else:
         with st.spinner("Analyzing... This may take a moment. ⏳"):
-            try:
-                jd_skills, skill_weights = extract_skills_from_jd(jd_text)
+            # Timings go to this run's own recorder, so concurrent sessions can't mix them up
+            with instrumentation.recording() as recorder:
+                try:
+                    with instrumentation.span('Total run'):
+                        jd_skills, skill_weights = extract_skills_from_jd(jd_text)
                 
-                if not jd_skills:
-                    st.error("Error: Could not extract any skills from the Job Description.")
-                    st.warning("This happens when the JD text doesn't contain any relevant keywords.")
-                    st.stop()
-
-                candidate_data = []
-                for uploaded_file in uploaded_files:
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmpfile:
-                        tmpfile.write(uploaded_file.getvalue())
-                        resume_text = read_pdf(tmpfile.name)
-                    os.remove(tmpfile.name)
-                    
-                    if resume_text:
-                        parser = ResumeParser(resume_text)
-                        details = parser.get_details()
-                        candidate_data.append({**details, 'filename': uploaded_file.name})
-
-                ranker = CandidateRanker(candidate_data, skill_weights, jd_text)
-                ranked_candidates = ranker.get_ranked_candidates()
-
-                st.success("Analysis Complete! 🎉")
+                        if not jd_skills:
+                            st.error("Error: Could not extract any skills from the Job Description.")
+                            st.warning("This happens when the JD text doesn't contain any relevant keywords.")
+                            st.stop()
+
+                        # Only the JD is re-processed when the uploads are unchanged;
+                        # otherwise just the new files are read, parsed and embedded
+                        candidate_keys = [(get_resume_cache().key_for(f.getvalue()), f.name) for f in uploaded_files]
+                        ranker = st.session_state.get('ranker')
+                        if (ranker is not None and ranker.skill_matrix is not None
+                                and st.session_state.get('ranked_uploads') == (ranking_mode, candidate_keys)):
+                            ranked_candidates = ranker.rerank(skill_weights, jd_text)
+                        else:
+                            # Covering every known skill lets the JD and weights change later without re-reading resumes
+                            ranker_class = KeywordRanker if keyword_only else CandidateRanker
+                            ranker = ranker_class([], skill_weights, jd_text, matrix_skills=SKILL_DB)
+                            ranker.candidate_data = build_candidates(uploaded_files, candidate_keys, ranker, keyword_only)
+                            ranked_candidates = ranker.get_ranked_candidates()
+                            st.session_state['ranked_uploads'] = (ranking_mode, candidate_keys)
+
+                        st.success("Analysis Complete! 🎉")
                 
-                # --- Store results in session state for display ---
-                st.session_state['ranked_candidates'] = ranked_candidates
+                        # --- Store results in session state for display ---
+                        st.session_state['ranked_candidates'] = ranked_candidates
+                        st.session_state['ranker'] = ranker
+                        st.session_state['jd_skill_weights'] = dict(skill_weights)
+                        st.session_state['run_id'] = st.session_state.get('run_id', 0) + 1
 
-            except Exception as e:
-                st.error(f"An unexpected error occurred: {e}")
-                st.exception(e)
+                except Exception as e:
+                    st.error(f"An unexpected error occurred: {e}")
+                    st.exception(e)
+                finally:
+                    st.session_state['stage_timings'] = recorder.summary()
+
+# --- Timing breakdown of the last run ---
+if 'stage_timings' in st.session_state:
+    st.sidebar.header("Last Run: Timing Breakdown")
+    st.sidebar.dataframe(
+        pd.DataFrame([
+            {
+                'Stage': stage,
+                'Calls': metrics['count'],
+                'Total (s)': round(metrics['total_s'], 3),
+                'Avg (ms)': round(metrics['mean_ms'], 2),
+            }
+            for stage, metrics in st.session_state['stage_timings'].items()
+        ]),
+        hide_index=True
+    )
 
 # --- Display Results ---
 if 'ranked_candidates' in st.session_state:
     st.header("Analysis Results")
+
+    # --- Re-weight skills: one sparse product over the pool, no resume is re-read ---
+    if 'ranker' in st.session_state:
+        with st.expander("Adjust Skill Weights"):
+            ranker = st.session_state['ranker']
+            columns = st.columns(4)
+            new_weights = {}
+            for i, (skill, weight) in enumerate(st.session_state['jd_skill_weights'].items()):
+                new_weights[skill] = columns[i % 4].number_input(
+                    skill, min_value=0, max_value=20, value=int(weight), step=1,
+                    key=f"weight_{st.session_state['run_id']}_{skill}"
+                )
+            if new_weights != ranker.skill_weights:
+                st.session_state['ranked_candidates'] = ranker.rerank(new_weights)
     
     # Iterate through each ranked candidate and display their details in an expander
     for i, candidate in enumerate(st.session_state['ranked_candidates']):
@@ -93,7 +215,10 @@ if 'ranked_candidates' in st.session_state:
             col1, col2, col3 = st.columns(3)
             col1.metric("Final Score", round(candidate.get('final_score', 0)))
             col2.metric("Keyword Score", round(candidate.get('keyword_score', 0)))
-            col3.metric("Semantic Score", f"{round(candidate.get('semantic_score', 0))}%")
+            if 'semantic_score' in candidate:
+                col3.metric("Semantic Score", f"{round(candidate['semantic_score'])}%")
+            else:
+                col3.metric("Semantic Score", "N/A")
             
             st.subheader("Matched Skills")
             matched_skills = candidate.get('matched_skills', [])
@@ -0,0 +1,78 @@
+"""
+Measures near-duplicate detection on a synthetic corpus with planted duplicates:
+fingerprinting cost against the parsing and embedding it saves, and how many
+planted duplicates were found (recall) without merging distinct resumes.
+
+Run from the project root:
+    python -m benchmarks.bench_dedup --resumes 500 --near-duplicates 100 --threshold 0.8
+"""
+import argparse
+import os
+import re
+import time
+
+from benchmarks.corpus import generate_corpus
+from parser.resume_parser import ResumeParser, clean_text, get_lean_nlp
+from utils.dedup import NearDuplicateIndex
+from utils.model_registry import get_sentence_model
+from utils.pdf_reader import read_pdf
+
+DUPLICATE_NAME = re.compile(r'dup_\d+_of_(\d+)\.pdf$')
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--data-dir', default='bench_data/dedup')
+    arg_parser.add_argument('--resumes', type=int, default=500)
+    arg_parser.add_argument('--near-duplicates', type=int, default=100)
+    arg_parser.add_argument('--threshold', type=float, default=0.8)
+    arg_parser.add_argument('--sample', type=int, default=50, help="Resumes parsed and embedded to estimate their cost.")
+    args = arg_parser.parse_args()
+
+    resumes_dir, _ = generate_corpus(args.data_dir, resumes=args.resumes, near_duplicates=args.near_duplicates)
+    # Originals first, so every planted duplicate arrives after its source
+    filenames = sorted(os.listdir(resumes_dir), key=lambda name: (name.startswith('dup_'), name))
+    texts = {filename: clean_text(read_pdf(os.path.join(resumes_dir, filename))) for filename in filenames}
+
+    index = NearDuplicateIndex(args.threshold)
+    start = time.perf_counter()
+    for filename in filenames:
+        index.add(filename, texts[filename])
+    fingerprint_s = time.perf_counter() - start
+
+    found, wrong = 0, 0
+    for filename in filenames:
+        representative = index.representative(filename)
+        if representative == filename:
+            continue
+        planted = DUPLICATE_NAME.match(filename)
+        if planted and representative == f"resume_{planted.group(1)}.pdf":
+            found += 1
+        else:
+            wrong += 1
+
+    # Per-resume cost of what a duplicate skips: lean parsing plus one encoder row
+    sample = [texts[filename] for filename in filenames[:args.sample]]
+    get_lean_nlp()
+    model = get_sentence_model()
+    start = time.perf_counter()
+    for text in sample:
+        ResumeParser(text, lean=True).get_details()
+    parse_s = (time.perf_counter() - start) / len(sample)
+    start = time.perf_counter()
+    model.encode(sample)
+    embed_s = (time.perf_counter() - start) / len(sample)
+
+    fingerprint_per_resume = fingerprint_s / len(filenames)
+    print(f"Resumes                : {len(filenames)} ({args.near_duplicates} planted near-duplicates)")
+    print(f"Fingerprint            : {fingerprint_per_resume * 1000:8.3f} ms/resume")
+    print(f"Parse + embed          : {(parse_s + embed_s) * 1000:8.3f} ms/resume")
+    print(f"Duplicates found       : {found}/{args.near_duplicates} (recall {found / max(args.near_duplicates, 1):.2%})")
+    print(f"Wrongly merged         : {wrong}")
+    saved_s = index.duplicate_count() * (parse_s + embed_s)
+    print(f"Net time saved         : {saved_s - fingerprint_s:8.2f} s "
+          f"({index.duplicate_count()} resumes skipped, {fingerprint_s:.2f} s fingerprinting)")
+
+
+if __name__ == '__main__':
+    main()
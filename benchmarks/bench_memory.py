@@ -0,0 +1,112 @@
+"""
+Reports how much memory a ranked candidate pool holds per 10k candidates, for
+the original dict rows with float32 embeddings and for CandidateRecords with
+float16 / int8 embeddings and text dropped after scoring. It also checks how
+closely the quantized rankings agree with the float32 one.
+
+Memory is what stays allocated after get_ranked_candidates(): the rows, the
+kept resume text, the embedding store and the skill matrix, measured with
+tracemalloc.
+
+Run from the project root:
+    python -m benchmarks.bench_memory --candidates 10000 --jds 3
+"""
+import argparse
+import random
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.corpus import make_jd_text, make_resume_text
+from ranker.candidate_ranker import CandidateRanker
+from ranker.candidate_record import CandidateRecord
+from ranker.embedding_store import quantize
+from utils.model_registry import get_sentence_model
+from utils.skill_extractor import extract_skills_from_jd
+
+CONFIGS = [
+    # (label, record type, embedding dtype, drop text)
+    ('dict rows, float32, text kept', dict, 'float32', False),
+    ('records, float32, text kept', CandidateRecord, 'float32', False),
+    ('records, float32, text dropped', CandidateRecord, 'float32', True),
+    ('records, float16, text dropped', CandidateRecord, 'float16', True),
+    ('records, int8, text dropped', CandidateRecord, 'int8', True),
+]
+
+
+def rank_pool(texts, embeddings, record_type, dtype, drop_text, jd_text, jd_embedding, skill_weights):
+    """Builds a fresh pool, ranks it and returns (ranker, ranked rows, retained bytes, peak bytes)."""
+    tracemalloc.start()
+    # Copies, so the pool owns its text and vectors as it would after parsing; like
+    # main.py's candidate_record, each vector is stored in `dtype` from the start
+    candidate_data = [
+        record_type(name=f"Candidate {i}", email=f"candidate{i}@example.com", resume_text=(text + ' ')[:-1],
+                    filename=f"resume_{i:06d}.pdf", resume_embedding=np.array(quantize(embedding, dtype)))
+        for i, (text, embedding) in enumerate(zip(texts, embeddings))
+    ]
+    ranker = CandidateRanker(candidate_data, skill_weights, jd_text, jd_embedding=jd_embedding, embedding_dtype=dtype)
+    ranked = ranker.get_ranked_candidates(drop_text=drop_text)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return ranker, ranked, retained, peak
+
+
+def agreement(reference, ranked, top_k):
+    """Compares a ranking with the float32 one: score error, top-k overlap and Spearman correlation."""
+    ref_scores = {row['filename']: row for row in reference}
+    semantic_error = max(abs(row['semantic_score'] - ref_scores[row['filename']]['semantic_score']) for row in ranked)
+    ref_top = {row['filename'] for row in reference[:top_k]}
+    overlap = len(ref_top & {row['filename'] for row in ranked[:top_k]}) / max(len(ref_top), 1)
+
+    order = {row['filename']: i for i, row in enumerate(reference)}
+    positions = np.asarray([order[row['filename']] for row in ranked], dtype=np.float64)
+    spearman = np.corrcoef(np.arange(len(positions)), positions)[0, 1] if len(positions) > 1 else 1.0
+    return semantic_error, overlap, spearman
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--candidates', type=int, default=10000)
+    arg_parser.add_argument('--jds', type=int, default=3, help="JDs the agreement is averaged over.")
+    arg_parser.add_argument('--top-k', type=int, default=100)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = [make_resume_text(rng, 12, 8) for _ in range(args.candidates)]
+    jd_texts = [make_jd_text(rng, 8) for _ in range(args.jds)]
+    model = get_sentence_model()
+    print(f"Encoding {len(texts)} synthetic resumes...")
+    embeddings = np.asarray(model.encode(texts, batch_size=64), dtype=np.float32)
+    jd_embeddings = model.encode(jd_texts)
+
+    per_10k = 10000 / len(texts)
+    memory = {}
+    quality = {label: [] for label, *_ in CONFIGS}
+    for jd_text, jd_embedding in zip(jd_texts, jd_embeddings):
+        _, skill_weights = extract_skills_from_jd(jd_text)
+        reference = None
+        for label, record_type, dtype, drop_text in CONFIGS:
+            ranker, ranked, retained, peak = rank_pool(texts, embeddings, record_type, dtype, drop_text,
+                                                       jd_text, jd_embedding, skill_weights)
+            # Peak includes fixed-size scratch buffers (e.g. one similarity block), so it isn't scaled
+            memory[label] = (retained * per_10k, ranker.resume_embeddings.nbytes * per_10k, peak)
+            if reference is None:
+                reference = ranked
+            quality[label].append(agreement(reference, ranked, args.top_k))
+            del ranker, ranked
+
+    print(f"\nMemory in MB: retained and embeddings per 10k candidates, peak for this run of {len(texts)}:")
+    print(f"  {'':<32} {'retained':>9} {'embeddings':>11} {'peak':>9}")
+    for label, (retained, embedding_bytes, peak) in memory.items():
+        print(f"  {label:<32} {retained / 1e6:>9.2f} {embedding_bytes / 1e6:>11.2f} {peak / 1e6:>9.2f}")
+
+    print(f"\nAgreement with the float32 dict ranking (mean over {len(jd_texts)} JDs):")
+    print(f"  {'':<32} {'max |d semantic|':>16} {f'top-{args.top_k} overlap':>16} {'spearman':>9}")
+    for label, rows in quality.items():
+        semantic_error, overlap, spearman = np.mean(rows, axis=0)
+        print(f"  {label:<32} {semantic_error:>16.3f} {overlap:>16.2%} {spearman:>9.4f}")
+
+
+if __name__ == '__main__':
+    main()
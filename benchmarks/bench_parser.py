@@ -0,0 +1,61 @@
+"""
+Compares ResumeParser in its full and lean modes on a folder of resume PDFs:
+checks that both give the same get_details() output and reports the time per resume.
+
+Run from the project root:
+    python -m benchmarks.bench_parser --resumes-dir data/resumes/ --repeat 3
+"""
+import argparse
+import os
+import time
+
+from parser.resume_parser import ResumeParser, get_lean_nlp
+from utils.model_registry import get_nlp
+from utils.pdf_reader import read_pdf
+
+
+def time_parser(texts, lean, repeat):
+    """Returns (best seconds per resume, outputs) over `repeat` runs."""
+    best = None
+    outputs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs = [ResumeParser(text, lean=lean).get_details() for text in texts]
+        elapsed = (time.perf_counter() - start) / len(texts)
+        best = elapsed if best is None else min(best, elapsed)
+    return best, outputs
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--resumes-dir', default='data/resumes/')
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    texts = []
+    for filename in sorted(os.listdir(args.resumes_dir)):
+        if filename.endswith('.pdf'):
+            text = read_pdf(os.path.join(args.resumes_dir, filename))
+            if text:
+                texts.append(text)
+    if not texts:
+        print(f"No readable PDFs in {args.resumes_dir}")
+        return
+
+    # Load both pipelines before timing
+    get_nlp()
+    get_lean_nlp()
+
+    full_time, full_outputs = time_parser(texts, lean=False, repeat=args.repeat)
+    lean_time, lean_outputs = time_parser(texts, lean=True, repeat=args.repeat)
+
+    mismatches = sum(1 for full, lean in zip(full_outputs, lean_outputs) if full != lean)
+    print(f"Resumes          : {len(texts)}")
+    print(f"Full parser      : {full_time * 1000:8.2f} ms/resume")
+    print(f"Lean parser      : {lean_time * 1000:8.2f} ms/resume")
+    print(f"Speed-up         : {full_time / lean_time:8.2f}x")
+    print(f"Output mismatches: {mismatches}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Measures semantic-scoring throughput (resumes/second) of CandidateRanker
+for the old one-resume-at-a-time path and the batched path at several batch sizes.
+
+Run from the project root:
+    python -m benchmarks.bench_semantic --resumes 500 --batch-sizes 1 8 32 64
+"""
+import argparse
+import random
+import time
+
+from ranker.candidate_ranker import CandidateRanker
+from utils.model_registry import get_sentence_model
+from utils.skill_extractor import SKILL_DB
+
+FILLER = (
+    "Worked closely with cross-functional teams to deliver projects on time. "
+    "Responsible for design, implementation and maintenance of production systems. "
+)
+
+
+def make_resume_texts(count, seed=0):
+    """Builds simple synthetic resume texts with a random mix of known skills."""
+    rng = random.Random(seed)
+    texts = []
+    for i in range(count):
+        skills = rng.sample(SKILL_DB, 12)
+        texts.append(
+            f"Candidate {i}\nSkills: {', '.join(skills)}\n"
+            + FILLER * rng.randint(3, 10)
+        )
+    return texts
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--resumes', type=int, default=256, help="Number of synthetic resumes to score.")
+    arg_parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 16, 32, 64, 128])
+    arg_parser.add_argument('--skip-unbatched', action='store_true', help="Skip the per-resume baseline.")
+    args = arg_parser.parse_args()
+
+    jd_text = "Looking for a python engineer with machine learning, docker and aws experience."
+    texts = make_resume_texts(args.resumes)
+    model = get_sentence_model()
+
+    # Warm the encoder so the first timing doesn't include lazy initialisation
+    model.encode(texts[:2])
+
+    print(f"Scoring {len(texts)} resumes")
+    if not args.skip_unbatched:
+        ranker = CandidateRanker([], {}, jd_text, model=model)
+        start = time.perf_counter()
+        for text in texts:
+            ranker._calculate_semantic_score(text)
+        elapsed = time.perf_counter() - start
+        print(f"  unbatched         : {len(texts) / elapsed:8.1f} resumes/s")
+
+    for batch_size in args.batch_sizes:
+        ranker = CandidateRanker([], {}, jd_text, model=model, batch_size=batch_size)
+        start = time.perf_counter()
+        ranker._calculate_semantic_scores(texts)
+        elapsed = time.perf_counter() - start
+        print(f"  batch_size={batch_size:<7}: {len(texts) / elapsed:8.1f} resumes/s")
+
+
+if __name__ == '__main__':
+    main()
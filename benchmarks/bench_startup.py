@@ -0,0 +1,72 @@
+"""
+Compares cold-start time of main.py in its hybrid and keyword modes.
+
+Every run is a fresh interpreter, like a cold-started worker. For each mode it
+reports the time to import main.py, the time until the ranked CSV is written,
+the complete process wall time and which heavy libraries ended up imported.
+
+Run from the project root:
+    python -m benchmarks.bench_startup --resumes 20 --repeat 3
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.corpus import generate_corpus
+
+HEAVY_MODULES = ('torch', 'sentence_transformers', 'spacy')
+
+# Runs inside the child interpreter; the timing line is the last thing printed
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+sys.argv = ['main.py'] + json.loads(sys.argv[1])
+main.main()
+done = time.perf_counter()
+print(json.dumps({
+    'import_s': imported - start,
+    'run_s': done - start,
+    'heavy_modules': [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def run_once(mode, jd_path, resumes_dir, output_dir):
+    args = ['--mode', mode, '--jd', jd_path, '--resumes-dir', resumes_dir,
+            '--output', os.path.join(output_dir, f"startup_{mode}.csv"), '--no-cache', '--workers', '1']
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-c', CHILD, json.dumps(args)],
+                               capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['wall_s'] = wall
+    return result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--data-dir', default='bench_data/startup')
+    arg_parser.add_argument('--resumes', type=int, default=20)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--modes', nargs='+', default=['keyword', 'hybrid'], choices=['keyword', 'hybrid'])
+    args = arg_parser.parse_args()
+
+    resumes_dir, jds_dir = generate_corpus(args.data_dir, resumes=args.resumes, jds=1)
+    jd_path = os.path.join(jds_dir, sorted(os.listdir(jds_dir))[0])
+
+    print(f"{'mode':<8} {'import main':>12} {'to CSV':>10} {'wall':>10}  heavy modules imported")
+    for mode in args.modes:
+        runs = [run_once(mode, jd_path, resumes_dir, args.data_dir) for _ in range(args.repeat)]
+        median = {key: statistics.median(run[key] for run in runs) for key in ('import_s', 'run_s', 'wall_s')}
+        print(f"{mode:<8} {median['import_s']:>10.3f} s {median['run_s']:>8.3f} s {median['wall_s']:>8.3f} s  "
+              f"{', '.join(runs[-1]['heavy_modules']) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
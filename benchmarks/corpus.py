@@ -0,0 +1,143 @@
+"""
+Generates a synthetic resume corpus (PDFs) and job descriptions with PyMuPDF,
+so benchmarks never need real candidate data or network access.
+
+Run from the project root:
+    python -m benchmarks.corpus --out-dir bench_data/1000 --resumes 1000 --skills 12 --paragraphs 8
+    python -m benchmarks.corpus --out-dir bench_data/dedup --resumes 1000 --near-duplicates 200
+"""
+import argparse
+import os
+import random
+
+import fitz  # PyMuPDF
+
+from utils.skill_extractor import SKILL_DB
+
+FIRST_NAMES = ['Aarav', 'Priya', 'John', 'Maria', 'Wei', 'Fatima', 'Lucas', 'Aisha', 'Kenji', 'Sofia', 'Rahul', 'Emma']
+LAST_NAMES = ['Sharma', 'Patel', 'Smith', 'Garcia', 'Chen', 'Khan', 'Silva', 'Okafor', 'Tanaka', 'Rossi', 'Mehta', 'Brown']
+TITLES = ['Software Engineer', 'Data Scientist', 'Solutions Architect', 'Backend Developer', 'ML Intern']
+COMPANIES = ['Infosys Limited', 'Nimbus Technologies', 'Apex Solutions', 'Tata Motors Limited', 'Quantum Technologies']
+UNIVERSITIES = ['Mumbai University', 'Stanford University', 'National Institute', 'City College', 'Delhi University']
+FILLER = [
+    "Delivered features end to end with a focus on reliability and clear documentation.",
+    "Collaborated with product and design teams to scope, build and ship improvements.",
+    "Reduced operational toil by automating recurring tasks and improving monitoring.",
+    "Mentored junior engineers and ran code reviews across several services.",
+    "Worked with stakeholders to translate business requirements into technical plans.",
+]
+
+
+def make_resume_text(rng, skills_per_resume, paragraphs):
+    """Builds one resume's text; `paragraphs` controls its length, `skills_per_resume` its skill density."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    skills = rng.sample(SKILL_DB, min(skills_per_resume, len(SKILL_DB)))
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}{rng.randint(1, 99)}@gmail.com | +91 98765 43210",
+        "",
+        "Experience",
+    ]
+    for _ in range(rng.randint(1, 3)):
+        lines += [rng.choice(TITLES), rng.choice(COMPANIES)]
+    lines += ["", "Education", rng.choice(UNIVERSITIES), "", "Projects"]
+    for _ in range(paragraphs):
+        # Sprinkle a few of the candidate's skills through the prose
+        lines.append(f"{rng.choice(FILLER)} Used {', '.join(rng.sample(skills, min(3, len(skills))))}.")
+    lines += ["", "Skills", ", ".join(skills)]
+    return "\n".join(lines)
+
+
+def make_near_duplicate(rng, text):
+    """Re-application of the same resume: one project line reworded and one line added."""
+    lines = text.split("\n")
+    projects = [i for i, line in enumerate(lines) if line.startswith(tuple(FILLER))]
+    if projects:
+        i = rng.choice(projects)
+        lines[i] = rng.choice(FILLER) + lines[i][lines[i].index(" Used "):]
+    lines.append(f"Updated {rng.choice(['January', 'April', 'July', 'October'])} {rng.randint(2019, 2025)}")
+    return "\n".join(lines)
+
+
+def make_jd_text(rng, skills_per_jd):
+    skills = rng.sample(SKILL_DB, min(skills_per_jd, len(SKILL_DB)))
+    return (
+        f"We are hiring a {rng.choice(TITLES)}. The ideal candidate has hands-on experience with "
+        f"{', '.join(skills[:-1])} and {skills[-1]}. {' '.join(rng.sample(FILLER, 3))}"
+    )
+
+
+def write_pdf(text, path, lines_per_page=45):
+    """Writes plain text to a PDF, starting a new page every `lines_per_page` lines."""
+    doc = fitz.open()
+    lines = text.split("\n")
+    for start in range(0, max(len(lines), 1), lines_per_page):
+        page = doc.new_page()
+        page.insert_text((50, 60), "\n".join(lines[start:start + lines_per_page]), fontsize=10)
+    doc.save(path)
+    doc.close()
+
+
+def generate_corpus(out_dir, resumes=100, skills_per_resume=12, paragraphs=8, jds=5, skills_per_jd=8, seed=0,
+                    near_duplicates=0):
+    """
+    Writes `resumes` PDFs to <out_dir>/resumes/ and `jds` job descriptions to <out_dir>/jds/.
+    Existing files are kept, so a corpus can be generated once and reused.
+    `near_duplicates` adds dup_<i>_of_<j>.pdf files, each a lightly edited copy of resume j.
+
+    Returns:
+        tuple: (resumes_dir, jds_dir)
+    """
+    rng = random.Random(seed)
+    resumes_dir = os.path.join(out_dir, 'resumes')
+    jds_dir = os.path.join(out_dir, 'jds')
+    os.makedirs(resumes_dir, exist_ok=True)
+    os.makedirs(jds_dir, exist_ok=True)
+
+    texts = []
+    for i in range(resumes):
+        # Text is always drawn so the corpus is identical however much already exists
+        text = make_resume_text(rng, skills_per_resume, paragraphs)
+        path = os.path.join(resumes_dir, f"resume_{i:06d}.pdf")
+        if not os.path.exists(path):
+            write_pdf(text, path)
+        if near_duplicates:
+            texts.append(text)
+
+    # Separate generator, so adding duplicates doesn't change the rest of the corpus
+    dup_rng = random.Random(seed + 1)
+    for i in range(near_duplicates if texts else 0):
+        source = dup_rng.randrange(len(texts))
+        text = make_near_duplicate(dup_rng, texts[source])
+        path = os.path.join(resumes_dir, f"dup_{i:06d}_of_{source:06d}.pdf")
+        if not os.path.exists(path):
+            write_pdf(text, path)
+
+    for i in range(jds):
+        text = make_jd_text(rng, skills_per_jd)
+        path = os.path.join(jds_dir, f"jd_{i:03d}.txt")
+        if not os.path.exists(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+    return resumes_dir, jds_dir
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--out-dir', default='bench_data/100')
+    arg_parser.add_argument('--resumes', type=int, default=100)
+    arg_parser.add_argument('--skills', type=int, default=12, help="Skills per resume (skill density).")
+    arg_parser.add_argument('--paragraphs', type=int, default=8, help="Prose paragraphs per resume (document size).")
+    arg_parser.add_argument('--jds', type=int, default=5)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--near-duplicates', type=int, default=0,
+                            help="Extra resumes that are lightly edited copies of earlier ones.")
+    args = arg_parser.parse_args()
+
+    resumes_dir, jds_dir = generate_corpus(args.out_dir, args.resumes, args.skills, args.paragraphs, args.jds,
+                                           seed=args.seed, near_duplicates=args.near_duplicates)
+    print(f"Corpus written to {resumes_dir} and {jds_dir}")
+
+
+if __name__ == '__main__':
+    main()
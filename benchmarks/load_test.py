@@ -0,0 +1,124 @@
+"""
+Load-tests a running ranking service (server.py) at increasing concurrency.
+
+Each request ranks a random sample of resumes from a synthetic corpus against
+one of its JDs. For every concurrency level it reports request throughput,
+resumes per second, p50/p95/p99 latency and errors, then the service's own
+micro-batching stats.
+
+Start the service without its cache so every resume really goes through
+parsing and the encoder, then run from the project root:
+    python server.py --no-cache
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --concurrency 1 2 4 8 16 --requests 64
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from benchmarks.corpus import generate_corpus
+
+
+def post_json(url, body, timeout):
+    request = urllib.request.Request(url, data=json.dumps(body).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def get_json(url, timeout=10):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def build_requests(resumes_dir, jds_dir, count, resumes_per_request, mode, seed):
+    """Pre-builds the request bodies so encoding them isn't part of the measured time."""
+    rng = random.Random(seed)
+    pdfs = []
+    for filename in sorted(os.listdir(resumes_dir)):
+        with open(os.path.join(resumes_dir, filename), 'rb') as f:
+            pdfs.append({'filename': filename, 'pdf_base64': base64.b64encode(f.read()).decode('ascii')})
+    jds = []
+    for filename in sorted(os.listdir(jds_dir)):
+        with open(os.path.join(jds_dir, filename), encoding='utf-8') as f:
+            jds.append(f.read())
+    return [
+        {'jd_text': rng.choice(jds), 'resumes': rng.sample(pdfs, min(resumes_per_request, len(pdfs))),
+         'top_k': 10, 'mode': mode}
+        for _ in range(count)
+    ]
+
+
+def run_level(url, bodies, concurrency, timeout):
+    """Sends every body with `concurrency` requests in flight and returns the level's metrics."""
+    def send(body):
+        start = time.perf_counter()
+        try:
+            post_json(f"{url}/rank", body, timeout)
+            return time.perf_counter() - start, False
+        except (urllib.error.URLError, OSError):
+            return time.perf_counter() - start, True
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(send, bodies))
+    total = time.perf_counter() - start
+
+    latencies_ms = np.asarray([seconds for seconds, _ in results]) * 1000
+    resumes = sum(len(body['resumes']) for body in bodies)
+    return {
+        'concurrency': concurrency,
+        'requests_per_s': round(len(bodies) / total, 2),
+        'resumes_per_s': round(resumes / total, 2),
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 1),
+        'p95_ms': round(float(np.percentile(latencies_ms, 95)), 1),
+        'p99_ms': round(float(np.percentile(latencies_ms, 99)), 1),
+        'errors': sum(1 for _, error in results if error),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--url', default='http://127.0.0.1:8000')
+    arg_parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    arg_parser.add_argument('--requests', type=int, default=64, help="Requests sent at each concurrency level.")
+    arg_parser.add_argument('--resumes-per-request', type=int, default=5)
+    arg_parser.add_argument('--mode', choices=['hybrid', 'keyword'], default='hybrid')
+    arg_parser.add_argument('--data-dir', default='bench_data/load_test')
+    arg_parser.add_argument('--corpus-size', type=int, default=200)
+    arg_parser.add_argument('--timeout', type=float, default=120)
+    arg_parser.add_argument('--output', default=None, help="Optional JSON file for the results.")
+    args = arg_parser.parse_args()
+
+    health = get_json(f"{args.url}/health")
+    print(f"Service is up: {health}")
+
+    resumes_dir, jds_dir = generate_corpus(args.data_dir, resumes=args.corpus_size)
+    results = []
+    print(f"{'concurrency':>11} {'req/s':>8} {'resumes/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for concurrency in args.concurrency:
+        bodies = build_requests(resumes_dir, jds_dir, args.requests, args.resumes_per_request, args.mode, concurrency)
+        level = run_level(args.url, bodies, concurrency, args.timeout)
+        results.append(level)
+        print(f"{level['concurrency']:>11} {level['requests_per_s']:>8.2f} {level['resumes_per_s']:>10.2f} "
+              f"{level['p50_ms']:>9.1f} {level['p95_ms']:>9.1f} {level['p99_ms']:>9.1f} {level['errors']:>7}")
+
+    encoder = get_json(f"{args.url}/metrics")['encoder']
+    print(f"Encoder micro-batches: {encoder['batches']}, mean size {encoder['mean_batch_size']}, "
+          f"largest {encoder['largest_batch']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'levels': results, 'encoder': encoder}, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
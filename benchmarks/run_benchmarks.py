@@ -0,0 +1,242 @@
+"""
+End-to-end benchmark suite.
+
+Generates synthetic corpora of each requested size and times every stage
+separately: read_pdf, ResumeParser, extract_skills_from_jd,
+_calculate_keyword_score, _calculate_semantic_score (per resume and batched)
+and the complete main.py pipeline. Each stage runs in a fresh process, so
+its peak RSS is reported on its own.
+
+Run from the project root:
+    python -m benchmarks.run_benchmarks --sizes 10 1000 10000 --output bench_results.json
+    python -m benchmarks.run_benchmarks --sizes 1000 --baseline bench_results.json --tolerance 0.15
+
+With --baseline the run exits with status 1 if any stage's throughput drops,
+or its p95 latency grows, by more than --tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+from benchmarks.corpus import generate_corpus
+
+STAGES = [
+    'read_pdf',
+    'ResumeParser',
+    'extract_skills_from_jd',
+    '_calculate_keyword_score',
+    '_calculate_semantic_score',
+    '_calculate_semantic_scores (batched)',
+    'main.py',
+]
+
+
+def _peak_rss_mb(usage):
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return usage.ru_maxrss / divisor
+
+
+def _summary(latencies, total_seconds, items):
+    latencies_ms = np.asarray(latencies) * 1000 if len(latencies) else np.zeros(1)
+    return {
+        'items': items,
+        'total_s': round(total_seconds, 4),
+        'throughput_per_s': round(items / total_seconds, 2) if total_seconds > 0 else None,
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 3),
+        'p95_ms': round(float(np.percentile(latencies_ms, 95)), 3),
+    }
+
+
+def _timed_each(func, items):
+    latencies = []
+    results = []
+    start = time.perf_counter()
+    for item in items:
+        item_start = time.perf_counter()
+        results.append(func(item))
+        latencies.append(time.perf_counter() - item_start)
+    return latencies, time.perf_counter() - start, results
+
+
+def _load_texts(resumes_dir):
+    from utils.pdf_reader import read_pdf
+    return [read_pdf(os.path.join(resumes_dir, f)) for f in sorted(os.listdir(resumes_dir)) if f.endswith('.pdf')]
+
+
+def _load_jds(jds_dir):
+    texts = []
+    for filename in sorted(os.listdir(jds_dir)):
+        with open(os.path.join(jds_dir, filename), encoding='utf-8') as f:
+            texts.append(f.read())
+    return texts
+
+
+def run_stage(stage, resumes_dir, jds_dir, semantic_sample):
+    """Runs one stage in the current (fresh) process and returns its metrics."""
+    if stage == 'read_pdf':
+        from utils.pdf_reader import read_pdf
+        paths = [os.path.join(resumes_dir, f) for f in sorted(os.listdir(resumes_dir)) if f.endswith('.pdf')]
+        latencies, total, _ = _timed_each(read_pdf, paths)
+        result = _summary(latencies, total, len(paths))
+
+    elif stage == 'ResumeParser':
+        from parser.resume_parser import ResumeParser, get_lean_nlp
+        texts = _load_texts(resumes_dir)
+        get_lean_nlp()
+        latencies, total, _ = _timed_each(lambda text: ResumeParser(text, lean=True).get_details(), texts)
+        result = _summary(latencies, total, len(texts))
+
+    elif stage == 'extract_skills_from_jd':
+        from utils.skill_extractor import extract_skills_from_jd
+        jds = _load_jds(jds_dir)
+        latencies, total, _ = _timed_each(extract_skills_from_jd, jds)
+        result = _summary(latencies, total, len(jds))
+
+    else:
+        from ranker.candidate_ranker import CandidateRanker
+        from utils.skill_extractor import extract_skills_from_jd
+        jd_text = _load_jds(jds_dir)[0]
+        _, skill_weights = extract_skills_from_jd(jd_text)
+        texts = _load_texts(resumes_dir)
+
+        if stage == '_calculate_keyword_score':
+            # Keyword scoring never touches the encoder, so don't load it
+            ranker = CandidateRanker([], skill_weights, jd_text, model=object())
+            latencies, total, _ = _timed_each(ranker._calculate_keyword_score, texts)
+            result = _summary(latencies, total, len(texts))
+
+        elif stage == '_calculate_semantic_score':
+            ranker = CandidateRanker([], skill_weights, jd_text)
+            ranker._get_jd_embedding()
+            # The one-at-a-time path is slow, so only a sample is timed
+            sample = texts[:semantic_sample]
+            latencies, total, _ = _timed_each(ranker._calculate_semantic_score, sample)
+            result = _summary(latencies, total, len(sample))
+
+        elif stage == '_calculate_semantic_scores (batched)':
+            ranker = CandidateRanker([], skill_weights, jd_text)
+            ranker._get_jd_embedding()
+            start = time.perf_counter()
+            ranker._calculate_semantic_scores(texts)
+            total = time.perf_counter() - start
+            result = _summary([total / len(texts)] * len(texts) if texts else [], total, len(texts))
+
+        else:
+            raise ValueError(f"Unknown stage: {stage}")
+
+    result['peak_rss_mb'] = round(_peak_rss_mb(resource.getrusage(resource.RUSAGE_SELF)), 1)
+    return result
+
+
+def run_pipeline(resumes_dir, jds_dir, workers):
+    """Times a complete `python main.py` run in a child process."""
+    jd_path = os.path.join(jds_dir, sorted(os.listdir(jds_dir))[0])
+    output_path = os.path.join(os.path.dirname(resumes_dir), 'ranked_candidates.csv')
+    command = [sys.executable, 'main.py', '--jd', jd_path, '--resumes-dir', resumes_dir,
+               '--output', output_path, '--no-cache']
+    if workers:
+        command += ['--workers', str(workers)]
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    total = time.perf_counter() - start
+    exit_code = os.waitstatus_to_exitcode(status)
+    if exit_code != 0:
+        # Negative for a signal, e.g. -9 when the run was OOM-killed
+        raise RuntimeError(f"main.py exited with code {exit_code}")
+    items = len([f for f in os.listdir(resumes_dir) if f.endswith('.pdf')])
+    result = _summary([total / items] * items if items else [], total, items)
+    result['peak_rss_mb'] = round(_peak_rss_mb(usage), 1)
+    return result
+
+
+def compare(results, baseline, tolerance):
+    """Returns a list of human-readable regressions versus a baseline results file."""
+    regressions = []
+    for size, stages in results['sizes'].items():
+        for stage, metrics in stages.items():
+            old = baseline.get('sizes', {}).get(size, {}).get(stage)
+            if not old:
+                continue
+            if old.get('throughput_per_s') and metrics.get('throughput_per_s') is not None:
+                if metrics['throughput_per_s'] < old['throughput_per_s'] * (1 - tolerance):
+                    regressions.append(
+                        f"[{size}] {stage}: throughput {metrics['throughput_per_s']}/s "
+                        f"vs baseline {old['throughput_per_s']}/s"
+                    )
+            if old.get('p95_ms') and metrics['p95_ms'] > old['p95_ms'] * (1 + tolerance):
+                regressions.append(f"[{size}] {stage}: p95 {metrics['p95_ms']} ms vs baseline {old['p95_ms']} ms")
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 10000])
+    arg_parser.add_argument('--stages', nargs='+', default=STAGES, choices=STAGES)
+    arg_parser.add_argument('--data-dir', default='bench_data', help="Where generated corpora are kept between runs.")
+    arg_parser.add_argument('--skills', type=int, default=12, help="Skills per resume.")
+    arg_parser.add_argument('--paragraphs', type=int, default=8, help="Prose paragraphs per resume.")
+    arg_parser.add_argument('--jds', type=int, default=20)
+    arg_parser.add_argument('--semantic-sample', type=int, default=200,
+                            help="Resumes timed through the one-at-a-time semantic path.")
+    arg_parser.add_argument('--workers', type=int, default=None, help="--workers passed to main.py.")
+    arg_parser.add_argument('--output', default='bench_results.json')
+    arg_parser.add_argument('--baseline', default=None, help="Earlier results file to compare against.")
+    arg_parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed relative slowdown before failing.")
+    args = arg_parser.parse_args()
+
+    results = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'config': {'skills': args.skills, 'paragraphs': args.paragraphs, 'jds': args.jds},
+        'sizes': {},
+    }
+
+    for size in args.sizes:
+        corpus_dir = os.path.join(args.data_dir, f"{size}_s{args.skills}_p{args.paragraphs}")
+        print(f"== {size} resumes ({corpus_dir})")
+        resumes_dir, jds_dir = generate_corpus(corpus_dir, size, args.skills, args.paragraphs, args.jds)
+        stage_results = {}
+        for stage in args.stages:
+            if stage == 'main.py':
+                metrics = run_pipeline(resumes_dir, jds_dir, args.workers)
+            else:
+                # A fresh process per stage keeps model loads and peak RSS separate
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+                    metrics = pool.submit(run_stage, stage, resumes_dir, jds_dir, args.semantic_sample).result()
+            stage_results[stage] = metrics
+            print(f"  {stage:<38} {metrics['throughput_per_s'] or 0:>10.1f}/s  "
+                  f"p50 {metrics['p50_ms']:>9.3f} ms  p95 {metrics['p95_ms']:>9.3f} ms  "
+                  f"peak RSS {metrics['peak_rss_mb']:>8.1f} MB")
+        results['sizes'][str(size)] = stage_results
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+
+if __name__ == '__main__':
+    main()
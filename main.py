@@ -1,16 +1,558 @@
+import argparse
 import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from itertools import islice
 import pandas as pd
-from utils.file_loader import load_jd
-from utils.pdf_reader import read_pdf
-from parser.resume_parser import ResumeParser # <-- CHANGED
-from ranker.candidate_ranker import CandidateRanker
+from utils.file_loader import load_jd, load_jds
+from utils.ingestion import ingest_resumes, extract_texts, parse_texts
+from ranker.candidate_ranker import CandidateRanker, KeywordRanker
+from ranker.multi_jd_ranker import MultiJDRanker
+from ranker.candidate_record import CandidateRecord
+from ranker.embedding_store import EMBEDDING_DTYPES, quantize
 from utils.skill_extractor import extract_skills_from_jd
+from utils.model_registry import warm_up
+from parser.resume_parser import get_lean_nlp, clean_text
+from utils.resume_cache import ResumeCache, DEFAULT_CACHE_PATH, DEFAULT_MAX_BYTES
+from utils.manifest import ResumeManifest, DEFAULT_MANIFEST_PATH
+from utils.dedup import NearDuplicateIndex
+from utils.result_writer import ResultWriter
+from utils.sharding import split_shards, write_jobs, claim_next_job, keep_claim, write_result, wait_for_results, \
+    remove_files, merge_top_k, SHARED_DIR_TIMEOUT_S
+from utils import instrumentation
+
+# Resumes looked up in the cache per batch
+CACHE_LOOKUP_BATCH = 256
+
+def parse_args():
+    arg_parser = argparse.ArgumentParser(description="Rank resumes against a job description.")
+    arg_parser.add_argument('--jd', default='data/job_description.txt', help="Path to the job description text file.")
+    arg_parser.add_argument('--jd-dir', default=None,
+                            help="Folder of .txt job descriptions: rank the resumes against all of them in one pass.")
+    arg_parser.add_argument('--output-dir', default='output/by_jd',
+                            help="With --jd-dir, one ranked CSV per JD plus best_fit.csv are written here.")
+    arg_parser.add_argument('--mode', choices=['hybrid', 'keyword'], default='hybrid',
+                            help="'keyword' ranks on keyword score only with regex-based parsing, for quick triage; "
+                                 "it never loads torch, sentence-transformers or spaCy.")
+    arg_parser.add_argument('--resumes-dir', default='data/resumes/', help="Folder containing the resume PDFs.")
+    arg_parser.add_argument('--output', default='output/ranked_candidates.csv', help="Where to write the ranked CSV.")
+    arg_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Worker processes for PDF reading and spaCy parsing (1 = sequential, for debugging).")
+    arg_parser.add_argument('--batch-size', type=int, default=32, help="Resumes per nlp.pipe batch.")
+    arg_parser.add_argument('--cache-path', default=DEFAULT_CACHE_PATH, help="Parsed-resume and embedding cache file.")
+    arg_parser.add_argument('--cache-size-mb', type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                            help="Cache size limit; least recently used entries are evicted past it.")
+    arg_parser.add_argument('--no-cache', action='store_true', help="Ignore the cache and process every resume.")
+    arg_parser.add_argument('--incremental', action='store_true',
+                            help="Only process PDFs that are new or changed since the last run (tracked in "
+                                 "--manifest-path), drop deleted ones and re-rank the merged set.")
+    arg_parser.add_argument('--manifest-path', default=DEFAULT_MANIFEST_PATH,
+                            help="SQLite manifest of processed resumes used by --incremental.")
+    arg_parser.add_argument('--dedup', action='store_true',
+                            help="Fingerprint resumes after text extraction, parse and embed only one copy per "
+                                 "near-duplicate cluster, and collapse duplicates in the output.")
+    arg_parser.add_argument('--dedup-threshold', type=float, default=0.8,
+                            help="Estimated Jaccard similarity (word shingles) at which two resumes count as copies.")
+    arg_parser.add_argument('--full-parse', action='store_true',
+                            help="Run the full spaCy pipeline over each resume instead of the lean NER-only parse.")
+    arg_parser.add_argument('--embedding-dtype', choices=EMBEDDING_DTYPES, default='float32',
+                            help="How resume embeddings are held while ranking: 'float16' halves and 'int8' "
+                                 "quarters their memory, at a small cost in semantic-score precision.")
+    arg_parser.add_argument('--drop-text', action='store_true',
+                            help="Release each resume's text once it has been scored; the ranked CSV then has "
+                                 "no resume_text column.")
+    arg_parser.add_argument('--top-k', type=int, default=None, help="Only keep the best K candidates in the ranked CSV.")
+    arg_parser.add_argument('--stream', action='store_true',
+                            help="Score resumes in chunks as they are parsed, keeping only the top-k in memory.")
+    arg_parser.add_argument('--stream-output', default='output/scored_candidates.jsonl',
+                            help="With --stream, every scored row is appended here (.csv or .jsonl).")
+    arg_parser.add_argument('--chunk-size', type=int, default=256, help="Candidates scored per chunk with --stream.")
+    arg_parser.add_argument('--shards', type=int, default=1,
+                            help="Split the resumes into this many shards, rank each in its own worker and merge "
+                                 "their top-k; the result is the same as an unsharded run.")
+    arg_parser.add_argument('--shard-dir', default=None,
+                            help="Folder where shard jobs and results are exchanged (a temporary folder by default). "
+                                 "Share it with other machines to let them run shards too.")
+    arg_parser.add_argument('--shard-local-workers', type=int, default=None,
+                            help="Worker processes started on this machine (default: one per shard); "
+                                 "0 leaves every shard to workers started elsewhere with --shard-worker.")
+    arg_parser.add_argument('--shard-timeout', type=float, default=None,
+                            help="Give up if shard results are still missing after this many seconds "
+                                 f"(default: no limit, or {SHARED_DIR_TIMEOUT_S} s with --shard-dir).")
+    arg_parser.add_argument('--shard-worker', default=None, metavar='SHARD_DIR',
+                            help="Run as a shard worker: process jobs from this folder until none are left.")
+    arg_parser.add_argument('--shard-wait', type=float, default=0,
+                            help="With --shard-worker, how long to keep polling for jobs while the folder is empty.")
+    arg_parser.add_argument('--trace', default=None, help="Record per-stage timings and write them to this file.")
+    arg_parser.add_argument('--trace-format', choices=['json', 'chrome'], default='json',
+                            help="'json' (summary + events) or 'chrome' (chrome://tracing / Perfetto).")
+    arg_parser.add_argument('--profile', choices=['cprofile', 'sample'], default=None,
+                            help="Profile the parsing and ranking loops.")
+    arg_parser.add_argument('--profile-output', default='output/profile', help="Folder for profiler output.")
+    return arg_parser.parse_args()
+
+def candidate_record(details, filename, embedding, embedding_dtype='float32'):
+    """
+    The row that gets ranked and written out for one resume. Only the columns
+    ranking needs are kept (not the experience/education lists), and the
+    embedding is stored in `embedding_dtype` right away.
+    """
+    return CandidateRecord(
+        name=details['name'] or "Not Found",
+        email=details['email'] or "Not Found",
+        resume_text=details['resume_text'],
+        filename=filename,
+        resume_embedding=quantize(embedding, embedding_dtype) if embedding is not None else None,
+    )
+
+def prepare_parsing(args):
+    """Loads what parsing needs for this run and returns the parse_texts/ingest_resumes options."""
+    keyword_only = args.mode == 'keyword'
+    if args.full_parse:
+        warm_up(load_sentence_model=False)
+    elif not keyword_only:
+        get_lean_nlp()
+    return dict(batch_size=args.batch_size, lean=not args.full_parse, regex_only=keyword_only)
+
+def read_texts(resume_paths, positions, args):
+    """Extracts the resumes at `positions` in parallel; returns {position: text} for the readable ones."""
+    texts = {}
+    if not positions:
+        return texts
+    paths = [resume_paths[position] for position in positions]
+    for index, path, text, error in extract_texts(paths, args.workers or os.cpu_count() or 1):
+        if error:
+            print(f"Skipping {os.path.basename(path)}: {error}")
+        else:
+            texts[positions[index]] = text
+    return texts
+
+def iter_representatives(resume_paths, hits, signatures, to_read, args, cache_keys, cache, dedup):
+    """
+    The --dedup part of iter_parsed_resumes: files every resume into its
+    near-duplicate cluster before anything is parsed, then yields one
+    (position, details, embedding, cache_key) per cluster.
+
+    Resumes are added in folder-list order, whichever PDF finished reading
+    first, so each cluster's representative is its lowest position and the
+    output doesn't depend on --workers. A representative that can't be read or
+    parsed is dropped and the next member of its cluster is used instead.
+
+    Args:
+        hits (dict): {position: (details, embedding)} for cache hits, fingerprinted from their text.
+        signatures (dict): {position: signature} cached for duplicates by an earlier run.
+        to_read (list): Positions of every other resume.
+    """
+    texts = read_texts(resume_paths, to_read, args)
+    for position in sorted([*hits, *signatures, *texts]):
+        path = resume_paths[position]
+        if position in signatures:
+            dedup.add(path, signature=signatures[position])
+        else:
+            dedup.add(path, hits[position][0]['resume_text'] if position in hits else clean_text(texts[position]))
+
+    positions = {path: position for position, path in enumerate(resume_paths)}
+    duplicates = [position for position in texts
+                  if dedup.representative(resume_paths[position]) != resume_paths[position]]
+    if cache is not None:
+        # A duplicate is never parsed, so its signature is all the cache keeps; the next run needn't read it
+        cache.put_signatures((cache_keys[position], dedup.signature(resume_paths[position])) for position in duplicates)
+    for position in duplicates:
+        del texts[position]
+
+    pending = sorted(positions[path] for path in dedup.members)
+    parse_options = None
+    while pending:
+        failed = []
+        to_parse = []
+        for position in pending:
+            if position in hits:
+                details, embedding = hits[position]
+                yield position, details, embedding, cache_keys[position]
+            else:
+                to_parse.append(position)
+        # Representatives known only by a cached signature are read now
+        texts.update(read_texts(resume_paths, [position for position in to_parse if position not in texts], args))
+        failed.extend(position for position in to_parse if position not in texts)
+
+        readable = [position for position in to_parse if position in texts]
+        if readable:
+            parse_options = parse_options or prepare_parsing(args)
+            items = ((position, resume_paths[position], texts.pop(position), None) for position in readable)
+            parsed = parse_texts(items, args.workers, **parse_options)
+            for position, path, details, error in parsed:
+                if error:
+                    print(f"Skipping {os.path.basename(path)}: {error}")
+                    failed.append(position)
+                    continue
+                yield position, details, None, cache_keys[position]
+
+        pending = []
+        for position in failed:
+            successor = dedup.drop(resume_paths[position])
+            if successor is not None:
+                pending.append(positions[successor])
+        pending.sort()
+
+def iter_parsed_resumes(resume_files, resume_paths, args, cache, dedup=None):
+    """
+    Yields (position, details, embedding, cache_key) for every readable resume:
+    cache hits first, then freshly parsed resumes as they complete.
+    `embedding` is None when the cache had no vector for the resume.
+    With `dedup`, only each near-duplicate cluster's representative is yielded;
+    the rest are linked there.
+    """
+    # Check the cache first; only resumes it doesn't know about get read and parsed.
+    # Lookups go in batches, so a warm run commits once per batch, not once per resume.
+    to_parse = []
+    hits = {}
+    signatures = {}
+    cache_keys = [None] * len(resume_files)
+    if cache is None:
+        to_parse = list(range(len(resume_files)))
+    else:
+        for start in range(0, len(resume_paths), CACHE_LOOKUP_BATCH):
+            positions = range(start, min(start + CACHE_LOOKUP_BATCH, len(resume_paths)))
+            for position in positions:
+                with open(resume_paths[position], 'rb') as f:
+                    cache_keys[position] = cache.key_for(f.read())
+            found = cache.get_many(cache_keys[position] for position in positions)
+            missed = []
+            for position in positions:
+                hit = found.get(cache_keys[position])
+                if hit is None or hit[0] is None:
+                    missed.append(position)
+                elif dedup is None:
+                    yield position, hit[0], hit[1], cache_keys[position]
+                else:
+                    hits[position] = hit
+            if dedup is not None:
+                found = cache.get_signatures(cache_keys[position] for position in missed)
+                for position in missed:
+                    signature = found.get(cache_keys[position])
+                    if signature is not None and len(signature) == dedup.hasher.num_perm:
+                        signatures[position] = signature
+                missed = [position for position in missed if position not in signatures]
+            to_parse.extend(missed)
+
+    if cache is not None:
+        print(f"{len(resume_files) - len(to_parse)} resumes loaded from cache, {len(to_parse)} to parse.")
+    if dedup is not None:
+        yield from iter_representatives(resume_paths, hits, signatures, to_parse, args, cache_keys, cache, dedup)
+        return
+    if not to_parse:
+        return
+
+    parse_paths = [resume_paths[position] for position in to_parse]
+    for index, path, details, error in ingest_resumes(parse_paths, args.workers, **prepare_parsing(args)):
+        position = to_parse[index]
+        if error:
+            print(f"Skipping {resume_files[position]}: {error}")
+            continue
+        yield position, details, None, cache_keys[position]
+
+def embed_missing(entries, ranker, cache):
+    """Embeds the resumes that have no vector yet (in one batch) and stores them in the cache."""
+    missing = [i for i, entry in enumerate(entries) if entry[2] is None]
+    if not missing:
+        return entries
+    embeddings = ranker.encode_resumes([entries[i][1]['resume_text'] for i in missing])
+    for i, embedding in zip(missing, embeddings):
+        position, details, _, cache_key = entries[i]
+        entries[i] = (position, details, embedding, cache_key)
+    if cache is not None:
+        cache.put_many((entries[i][3], entries[i][1], entries[i][2]) for i in missing)
+    return entries
+
+def run_shard_job(job, args, cache):
+    """
+    Runs the full ResumeParser + CandidateRanker pipeline on one shard.
+
+    Returns:
+        list: The shard's top-k as [position in the coordinator's resume list, row] pairs, best first.
+    """
+    # The job decides what is computed; this worker only decides how many processes it uses
+    shard_args = argparse.Namespace(**{**vars(args), 'mode': job['mode'], 'full_parse': job['full_parse'],
+                                       'batch_size': job['batch_size']})
+    _, skill_weights = extract_skills_from_jd(job['jd_text'])
+    if job['mode'] == 'keyword':
+        cache = None
+        ranker = KeywordRanker([], skill_weights, job['jd_text'])
+    else:
+        ranker = CandidateRanker([], skill_weights, job['jd_text'], embedding_dtype=job['embedding_dtype'])
+
+    resume_files = job['files']
+    resume_paths = [os.path.join(job['resumes_dir'], f) for f in resume_files]
+    entries = sorted(iter_parsed_resumes(resume_files, resume_paths, shard_args, cache), key=lambda entry: entry[0])
+    if job['mode'] != 'keyword':
+        entries = embed_missing(entries, ranker, cache)
+    ranker.candidate_data = [
+        candidate_record(details, resume_files[position], embedding, job['embedding_dtype'])
+        for position, details, embedding, _ in entries
+    ]
+    del entries
+
+    ranked_candidates = ranker.get_ranked_candidates(drop_text=job['drop_text'])[:job['top_k']]
+    position_of = {filename: job['offset'] + i for i, filename in enumerate(resume_files)}
+    return [[position_of[candidate['filename']], dict(candidate)] for candidate in ranked_candidates]
+
+def run_shard_worker(args):
+    """Claims and runs jobs from --shard-worker until none are left (after --shard-wait seconds idle)."""
+    shard_dir = args.shard_worker
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    cache = None if args.no_cache else ResumeCache(args.cache_path, int(args.cache_size_mb * 1024 * 1024))
+    idle_since = time.monotonic()
+    while True:
+        claimed = claim_next_job(shard_dir)
+        if claimed is None:
+            if time.monotonic() - idle_since >= args.shard_wait:
+                break
+            time.sleep(0.5)
+            continue
+        name, job = claimed
+        print(f"[{worker_id}] Ranking shard {name} ({len(job['files'])} resumes)...")
+        start = time.perf_counter()
+        try:
+            with keep_claim(shard_dir, name):
+                rows = run_shard_job(job, args, cache if job['use_cache'] else None)
+            result = {'rows': rows, 'worker': worker_id, 'elapsed_s': round(time.perf_counter() - start, 3)}
+        except Exception as e:
+            # Reported to the coordinator instead of leaving it waiting for this shard
+            result = {'error': f"{type(e).__name__}: {e}", 'worker': worker_id}
+        write_result(shard_dir, name, result)
+        idle_since = time.monotonic()
+    if cache is not None:
+        cache.close()
+
+def run_sharded(args, jd_text):
+    """
+    Coordinates a sharded run: writes one job per shard, starts the local workers,
+    waits for every shard's top-k and merges them.
+
+    Returns:
+        list: The global top-k, or None if a shard failed.
+    """
+    resume_files = [f for f in os.listdir(args.resumes_dir) if f.endswith('.pdf')]
+    shards = split_shards(resume_files, args.shards)
+    jobs = [
+        {
+            'resumes_dir': os.path.abspath(args.resumes_dir), 'files': files, 'offset': offset,
+            'jd_text': jd_text, 'mode': args.mode, 'top_k': args.top_k, 'full_parse': args.full_parse,
+            'batch_size': args.batch_size, 'embedding_dtype': args.embedding_dtype, 'drop_text': args.drop_text,
+            'use_cache': not args.no_cache,
+        }
+        for offset, files in shards
+    ]
+    shard_dir = args.shard_dir or tempfile.mkdtemp(prefix='resume_shards_')
+    names = write_jobs(shard_dir, uuid.uuid4().hex[:8], jobs)
+
+    local_workers = len(jobs) if args.shard_local_workers is None else min(args.shard_local_workers, len(jobs))
+    print(f"Ranking {len(resume_files)} resumes in {len(jobs)} shard(s) with {local_workers} local worker(s)...")
+    # Local workers are started exactly like workers on other machines would be
+    command = [
+        sys.executable, os.path.abspath(__file__), '--shard-worker', shard_dir,
+        '--workers', str(max(1, args.workers // max(local_workers, 1))),
+        '--cache-path', args.cache_path, '--cache-size-mb', str(args.cache_size_mb),
+    ] + (['--no-cache'] if args.no_cache else [])
+    processes = [subprocess.Popen(command) for _ in range(local_workers)]
+    # Without a shared folder nobody else can pick up a shard, so stop waiting once the local workers are gone
+    workers_alive = None if args.shard_dir else (lambda: any(process.poll() is None for process in processes))
+    timeout = args.shard_timeout
+    if timeout is None and args.shard_dir:
+        timeout = SHARED_DIR_TIMEOUT_S
+
+    try:
+        with instrumentation.profiled('sharded ranking'):
+            results = wait_for_results(shard_dir, names, timeout, workers_alive=workers_alive)
+    except (RuntimeError, TimeoutError) as e:
+        print(f"Error: {e}")
+        for process in processes:
+            process.terminate()
+        return None
+    finally:
+        for process in processes:
+            process.wait()
+        remove_files(shard_dir, names)
+        if not args.shard_dir:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+
+    for name in names:
+        print(f"  {name}: {len(results[name]['rows'])} rows from {results[name]['worker']} "
+              f"in {results[name]['elapsed_s']:.2f} s")
+    return merge_top_k([results[name]['rows'] for name in names], args.top_k)
+
+def write_ranking(args, ranked_candidates):
+    """Writes the ranked CSV to --output."""
+    output_path = args.output
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    df = pd.DataFrame(ranked_candidates)
+    df.to_csv(output_path, index=False)
+
+    print(f"Ranking complete! Results saved to {output_path}")
+
+def report_instrumentation(args):
+    """Prints the per-stage breakdown and writes the trace / profiles that were asked for."""
+    print("\nStage timings:")
+    for stage, metrics in instrumentation.summary().items():
+        print(f"  {stage:<32} {metrics['count']:>7}x  {metrics['total_s']:>9.3f} s  {metrics['mean_ms']:>9.2f} ms avg")
+    if args.trace:
+        if args.trace_format == 'chrome':
+            instrumentation.write_chrome_trace(args.trace)
+        else:
+            instrumentation.write_json(args.trace)
+        print(f"Trace saved to {args.trace}")
+    if args.profile:
+        instrumentation.write_profiles(args.profile_output)
+        print(f"Profiles saved to {args.profile_output}")
+
+def sync_manifest(args, ranker, cache):
+    """
+    Brings the manifest up to date with --resumes-dir: only new or changed PDFs are
+    parsed and embedded, and deleted ones are dropped.
+
+    Returns:
+        tuple: (resume_files, entries) for the whole merged folder, where `entries`
+        yields (position, details, embedding, cache_key) like iter_parsed_resumes.
+    """
+    manifest = ResumeManifest(args.manifest_path)
+    changes = manifest.scan(args.resumes_dir)
+    print(f"Manifest: {len(changes.unchanged)} unchanged, {len(changes.new)} new, "
+          f"{len(changes.changed)} changed, {len(changes.deleted)} deleted resumes.")
+
+    to_parse = changes.new + changes.changed
+    to_parse_paths = [os.path.join(args.resumes_dir, f) for f in to_parse]
+    with instrumentation.profiled('parsing'):
+        parsed = sorted(iter_parsed_resumes(to_parse, to_parse_paths, args, cache), key=lambda entry: entry[0])
+    parsed = embed_missing(parsed, ranker, cache)
+
+    # Unreadable files are recorded too, so they aren't retried until they change
+    readable = {position for position, _, _, _ in parsed}
+    manifest.update(args.resumes_dir, [
+        (to_parse[position], changes.hashes[to_parse[position]], details, embedding)
+        for position, details, embedding, _ in parsed
+    ] + [
+        (filename, changes.hashes[filename], None, None)
+        for position, filename in enumerate(to_parse) if position not in readable
+    ], changes.stats)
+    manifest.remove(args.resumes_dir, changes.deleted)
+
+    # Records are streamed from the manifest; each file name is known by the time its entry is used
+    resume_files = []
+
+    def merged_entries():
+        try:
+            for position, (filename, details, embedding) in enumerate(manifest.records(args.resumes_dir)):
+                resume_files.append(filename)
+                yield position, details, embedding, None
+        finally:
+            manifest.close()
+
+    return resume_files, merged_entries()
+
+def collect_resumes(args, ranker, cache, dedup=None):
+    """
+    Returns (resume_files, parsed) for --resumes-dir, where `parsed` yields
+    (position, details, embedding, cache_key) for every readable resume
+    (one per near-duplicate cluster with `dedup`).
+    """
+    if args.incremental:
+        return sync_manifest(args, ranker, cache)
+    resume_files = [f for f in os.listdir(args.resumes_dir) if f.endswith('.pdf')]
+    resume_paths = [os.path.join(args.resumes_dir, f) for f in resume_files]
+    print(f"Found {len(resume_files)} resumes to process with {args.workers} worker(s)...")
+    return resume_files, iter_parsed_resumes(resume_files, resume_paths, args, cache, dedup)
+
+def add_duplicate_info(candidates, resumes_dir, dedup):
+    """Adds each candidate's near-duplicate cluster size and the files collapsed into it."""
+    print(f"{dedup.duplicate_count()} near-duplicate resumes were linked to an earlier copy and collapsed.")
+    for candidate in candidates:
+        members = dedup.members.get(os.path.join(resumes_dir, candidate['filename']), [])
+        candidate['cluster_size'] = max(len(members), 1)
+        candidate['duplicates'] = [os.path.basename(path) for path in members[1:]]
+
+def run_multi_jd(args, cache):
+    """Ranks the resumes against every JD in --jd-dir, parsing and embedding each resume only once."""
+    jds = load_jds(args.jd_dir)
+    if not jds:
+        print(f"Error: No .txt job descriptions found in {args.jd_dir}")
+        return
+
+    ranker = MultiJDRanker([], jds, batch_size=args.batch_size, embedding_dtype=args.embedding_dtype)
+    for jd_name in ranker.skipped_jds:
+        print(f"Skipping JD {jd_name}: could not extract any skills.")
+    if not ranker.jd_texts:
+        return
+
+    dedup = NearDuplicateIndex(args.dedup_threshold) if args.dedup else None
+    resume_files, parsed = collect_resumes(args, ranker, cache, dedup)
+    with instrumentation.profiled('parsing'):
+        entries = sorted(parsed, key=lambda entry: entry[0])
+    entries = embed_missing(entries, ranker, cache)
+    ranker.candidate_data = [
+        candidate_record(details, resume_files[position], embedding, args.embedding_dtype)
+        for position, details, embedding, _ in entries
+    ]
+    del entries
+    if dedup is not None:
+        add_duplicate_info(ranker.candidate_data, args.resumes_dir, dedup)
+
+    print(f"Ranking candidates against {len(ranker.jd_texts)} job descriptions...")
+    with instrumentation.profiled('ranking'):
+        ranked_by_jd, best_fit = ranker.get_ranked_candidates()
+    if not best_fit:
+        print("No candidates were processed. Check the resumes directory.")
+        return
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for jd_name, ranked_candidates in ranked_by_jd.items():
+        pd.DataFrame(ranked_candidates[:args.top_k]).to_csv(os.path.join(args.output_dir, f"{jd_name}.csv"), index=False)
+    best_fit_path = os.path.join(args.output_dir, 'best_fit.csv')
+    pd.DataFrame(best_fit).sort_values('best_fit_score', ascending=False, kind='stable').to_csv(best_fit_path, index=False)
+    print(f"Ranking complete! {len(ranked_by_jd)} ranked CSVs and {best_fit_path} saved to {args.output_dir}")
 
 def main():
+    args = parse_args()
+    if args.trace or args.profile:
+        instrumentation.enable(profile=args.profile)
+
+    if args.shard_worker:
+        run_shard_worker(args)
+        return
+
+    if args.shards > 1 and (args.stream or args.jd_dir or args.incremental or args.dedup):
+        print("Error: --shards can't be combined with --stream, --jd-dir, --incremental or --dedup.")
+        return
+    if args.shards > 1 and args.shard_local_workers == 0 and not args.shard_dir:
+        # A temporary folder is only visible to local workers, so nobody could ever run the shards
+        print("Error: --shard-local-workers 0 requires --shard-dir.")
+        return
+    if args.incremental and args.mode == 'keyword':
+        print("Error: --incremental stores spaCy-parsed resumes and embeddings; drop --mode keyword.")
+        return
+    if args.incremental and args.dedup:
+        print("Error: --dedup works on a full scan of the folder; drop it when using --incremental.")
+        return
+
+    if args.jd_dir:
+        if args.mode == 'keyword':
+            print("Error: --jd-dir needs the semantic model; drop --mode keyword.")
+            return
+        if args.stream:
+            print("Error: --stream ranks against a single JD; drop it when using --jd-dir.")
+            return
+        cache = None if args.no_cache else ResumeCache(args.cache_path, int(args.cache_size_mb * 1024 * 1024))
+        run_multi_jd(args, cache)
+        if instrumentation.is_enabled():
+            report_instrumentation(args)
+        return
+
     # Paths
-    jd_path = 'data/job_description.txt'
-    resumes_dir = 'data/resumes/'
-    output_path = 'output/ranked_candidates.csv'
+    jd_path = args.jd
 
     # Load JD and extract skills/weights
     jd_text = load_jd(jd_path)
@@ -23,41 +565,79 @@ def main():
         print("Could not extract skills from the job description.")
         return
 
+    if args.shards > 1:
+        ranked_candidates = run_sharded(args, jd_text)
+        if ranked_candidates:
+            write_ranking(args, ranked_candidates)
+        elif ranked_candidates is not None:
+            print("No candidates were processed. Check the resumes directory.")
+        if instrumentation.is_enabled():
+            report_instrumentation(args)
+        return
+
+    if args.mode == 'keyword':
+        # Cached entries hold spaCy-parsed details and embeddings, so keyword runs neither read nor fill it
+        cache = None
+        ranker = KeywordRanker([], skill_weights, jd_text)
+    else:
+        cache = None if args.no_cache else ResumeCache(args.cache_path, int(args.cache_size_mb * 1024 * 1024))
+        ranker = CandidateRanker([], skill_weights, jd_text, embedding_dtype=args.embedding_dtype)
     # Process resumes
-    candidate_data = []
-    resume_files = [f for f in os.listdir(resumes_dir) if f.endswith('.pdf')]
-    
-    print(f"Found {len(resume_files)} resumes to process...")
-
-    for filename in resume_files:
-        resume_path = os.path.join(resumes_dir, filename)
-        resume_text = read_pdf(resume_path)
-        
-        if resume_text:
-            parser = ResumeParser(resume_text) # <-- CHANGED
-            details = parser.get_details()     # <-- CHANGED
-            
-            candidate_data.append({
-                'name': details['name'] or "Not Found",
-                'email': details['email'] or "Not Found",
-                'resume_text': details['text'],
-                'filename': filename
-            })
-    
-    if not candidate_data:
+    dedup = NearDuplicateIndex(args.dedup_threshold) if args.dedup else None
+    resume_files, parsed = collect_resumes(args, ranker, cache, dedup)
+
+    if args.stream:
+        # Resumes are embedded and scored chunk by chunk as they arrive; every
+        # row goes straight to disk and only the top-k stay in memory.
+        def scorable_candidates():
+            while True:
+                chunk = list(islice(parsed, args.chunk_size))
+                if not chunk:
+                    return
+                if args.mode != 'keyword':
+                    chunk = embed_missing(chunk, ranker, cache)
+                for position, details, embedding, _ in chunk:
+                    yield candidate_record(details, resume_files[position], embedding, args.embedding_dtype)
+
+        print("Ranking candidates (streaming)...")
+        with ResultWriter(args.stream_output) as writer, instrumentation.profiled('streaming'):
+            ranked_candidates = ranker.stream_ranked_candidates(
+                scorable_candidates(), top_k=args.top_k, chunk_size=args.chunk_size, on_scored=writer.write
+            )
+        print(f"{writer.rows_written} scored rows written to {args.stream_output}")
+        if dedup is not None:
+            # Clusters are only complete once every resume has been read
+            add_duplicate_info(ranked_candidates, args.resumes_dir, dedup)
+    else:
+        # Results arrive in completion order; sorting them back by position keeps
+        # the CSV identical to a sequential (--workers 1) run.
+        with instrumentation.profiled('parsing'):
+            entries = sorted(parsed, key=lambda entry: entry[0])
+        if args.mode != 'keyword':
+            entries = embed_missing(entries, ranker, cache)
+        ranker.candidate_data = [
+            candidate_record(details, resume_files[position], embedding, args.embedding_dtype)
+            for position, details, embedding, _ in entries
+        ]
+        # The parsed details (experience, education, ...) aren't needed for ranking
+        del entries
+        if dedup is not None:
+            add_duplicate_info(ranker.candidate_data, args.resumes_dir, dedup)
+
+        # Rank candidates
+        print("Ranking candidates...")
+        with instrumentation.profiled('ranking'):
+            ranked_candidates = ranker.get_ranked_candidates(drop_text=args.drop_text)[:args.top_k]
+
+    if not ranked_candidates:
         print("No candidates were processed. Check the resumes directory.")
         return
 
-    # Rank candidates
-    print("Ranking candidates...")
-    ranker = CandidateRanker(candidate_data, skill_weights, jd_text)
-    ranked_candidates = ranker.get_ranked_candidates()
-
     # Save to CSV
-    df = pd.DataFrame(ranked_candidates)
-    df.to_csv(output_path, index=False)
+    write_ranking(args, ranked_candidates)
 
-    print(f"Ranking complete! Results saved to {output_path}")
+    if instrumentation.is_enabled():
+        report_instrumentation(args)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,18 +1,107 @@
-import spacy
 import re
+from utils.model_registry import get_nlp
+from utils.instrumentation import span
+
+# Bump whenever extraction output changes so cached results are invalidated
+PARSER_VERSION = '1'
+
+# Number of leading characters searched for the candidate's name
+HEADER_WINDOW = 300
+
+
+# The only pipe name extraction needs; lean mode loads nothing else
+LEAN_PIPES = ('ner',)
+
+# --- Section headers (matched as whole lines, case-insensitively) ---
+SECTION_KEYWORDS = {
+    'experience': ['professional experience', 'experience', 'work history'],
+    'education': ['education', 'academic background'],
+}
+# Headers that end the current section
+STOP_KEYWORDS = ['skills', 'education', 'experience', 'projects', 'awards']
+
+_HEADER_REGEX = re.compile(
+    r'^\s*(' + '|'.join(dict.fromkeys(
+        [kw for keywords in SECTION_KEYWORDS.values() for kw in keywords] + STOP_KEYWORDS
+    )) + r')\s*$',
+    re.IGNORECASE
+)
+
+
+def clean_text(resume_text):
+    """Collapses all whitespace runs into single spaces."""
+    return re.sub(r'\s+', ' ', resume_text)
+
+
+def get_lean_nlp():
+    """Returns the shared NER-only pipeline used by lean parsing."""
+    return get_nlp(enable=LEAN_PIPES)
+
+
+def split_sections(raw_text):
+    """
+    Splits a resume into all SECTION_KEYWORDS sections in a single pass over its lines.
+    Gives the same text as ResumeParser._extract_section for each section.
+
+    Returns:
+        dict: {section name: section text}
+    """
+    captured = {name: [] for name in SECTION_KEYWORDS}
+    state = {name: 'waiting' for name in SECTION_KEYWORDS}
+    for line in raw_text.split('\n'):
+        match = _HEADER_REGEX.match(line)
+        header = match.group(1).casefold() if match else None
+        for name, keywords in SECTION_KEYWORDS.items():
+            if state[name] == 'done':
+                continue
+            # The section's own headers are skipped (and start capturing)
+            if header in keywords:
+                state[name] = 'capturing'
+                continue
+            if state[name] == 'capturing':
+                if header in STOP_KEYWORDS:
+                    state[name] = 'done'
+                    continue
+                captured[name].append(line + '\n')
+    return {name: ''.join(lines) for name, lines in captured.items()}
+
 
 class ResumeParser:
-    def __init__(self, resume_text):
-        self.nlp = spacy.load('en_core_web_sm')
-        self.raw_text = resume_text
-        self.cleaned_text = re.sub(r'\s+', ' ', resume_text)
-        self.doc = self.nlp(self.cleaned_text)
-        
-        # --- Run all extraction methods ---
-        self.email = self._extract_email()
-        self.name = self._extract_name()
-        self.experience = self._extract_experience()
-        self.education = self._extract_education()
+    def __init__(self, resume_text, nlp=None, doc=None, header_doc=None, lean=False, regex_only=False):
+        """
+        `doc` and `header_doc` may be passed in when the text was already run
+        through the pipeline (e.g. with nlp.pipe); otherwise they are computed here.
+
+        With `lean=True` the output is the same, but only the NER pipe is loaded,
+        it only runs on the header window used for the name (no full-document
+        pass), and sections are split once up front.
+
+        With `regex_only=True` spaCy is never imported: the name comes from the
+        email / header-line fallbacks only, so it can differ from the other modes.
+        """
+        self.lean = lean or regex_only
+        self.regex_only = regex_only
+        # Reuse the process-wide pipeline instead of loading it per resume
+        if regex_only:
+            self.nlp = None
+        else:
+            self.nlp = nlp or (get_lean_nlp() if lean else get_nlp())
+        with span('ResumeParser', chars=len(resume_text)) as stage:
+            self.raw_text = resume_text
+            self.cleaned_text = clean_text(resume_text)
+            if self.lean:
+                self.doc = None
+                self._sections = split_sections(resume_text)
+            else:
+                self.doc = doc if doc is not None else self.nlp(self.cleaned_text)
+            self.header_doc = header_doc
+            
+            # --- Run all extraction methods ---
+            self.email = self._extract_email()
+            self.name = self._extract_name()
+            self.experience = self._extract_experience()
+            self.education = self._extract_education()
+            stage.set(tokens=len(self.doc) if self.doc is not None else len(self.header_doc or ()))
 
     def _extract_email(self):
         """A highly robust, two-step regex to find emails, even with typos."""
@@ -32,11 +121,14 @@ class ResumeParser:
 
     def _extract_name(self):
         """Our proven, multi-tiered strategy for name extraction."""
-        doc_start = self.nlp(self.cleaned_text[:300])
-        person_ents = [ent.text.strip() for ent in doc_start.ents if ent.label_ == 'PERSON']
-        for name in person_ents:
-            if 2 <= len(name.split()) <= 4 and len(name) < 35:
-                return name.title()
+        if not self.regex_only:
+            if self.header_doc is None:
+                self.header_doc = self.nlp(self.cleaned_text[:HEADER_WINDOW])
+            doc_start = self.header_doc
+            person_ents = [ent.text.strip() for ent in doc_start.ents if ent.label_ == 'PERSON']
+            for name in person_ents:
+                if 2 <= len(name.split()) <= 4 and len(name) < 35:
+                    return name.title()
 
         if self.email and self.email != "Email Not Found":
             name_from_email = self.email.split('@')[0]
@@ -72,7 +164,7 @@ class ResumeParser:
             # If we've found the section, start capturing text
             if found_section:
                 # Stop if we hit another major section header
-                if any(re.match(r'^\s*' + kw + r'\s*$', line, re.IGNORECASE) for kw in ['skills', 'education', 'experience', 'projects', 'awards']):
+                if any(re.match(r'^\s*' + kw + r'\s*$', line, re.IGNORECASE) for kw in STOP_KEYWORDS):
                     # But don't stop if the line itself is part of the current section
                     if not any(re.match(r'^\s*' + current_kw + r'\s*$', line, re.IGNORECASE) for current_kw in section_keywords):
                         break
@@ -81,7 +173,10 @@ class ResumeParser:
 
     def _extract_experience(self):
         """Extracts work experience by finding the relevant section and parsing it."""
-        experience_text = self._extract_section(['professional experience', 'experience', 'work history'])
+        if self.lean:
+            experience_text = self._sections['experience']
+        else:
+            experience_text = self._extract_section(SECTION_KEYWORDS['experience'])
         if not experience_text:
             return []
         
@@ -97,7 +192,10 @@ class ResumeParser:
 
     def _extract_education(self):
         """Extracts education by finding the relevant section and parsing it."""
-        education_text = self._extract_section(['education', 'academic background'])
+        if self.lean:
+            education_text = self._sections['education']
+        else:
+            education_text = self._extract_section(SECTION_KEYWORDS['education'])
         if not education_text:
             return []
             
@@ -1,60 +1,243 @@
+import heapq
+from itertools import islice
 import numpy as np
-from sentence_transformers import SentenceTransformer, util
-import re
+from utils.model_registry import get_sentence_model
+from utils.instrumentation import span
+from utils.skill_extractor import SKILL_ALIASES
+from utils.skill_index import get_skill_index
+from ranker.skill_matrix import SkillMatrix
+from ranker.embedding_store import EmbeddingStore
 
 class CandidateRanker:
-    def __init__(self, candidate_data, skill_weights, jd_text):
+    def __init__(self, candidate_data, skill_weights, jd_text, model=None, batch_size=32, matrix_skills=None,
+                 jd_embedding=None, embedding_dtype='float32'):
         self.candidate_data = candidate_data
         self.skill_weights = skill_weights
         self.jd_text = jd_text
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        self._model = model
+        # Number of resumes sent through the encoder per forward pass
+        self.batch_size = batch_size
+        # Columns of the candidate x skill matrix; defaults to the JD's skills.
+        # Pass SKILL_DB to be able to re-weight any skill (or switch JD) later.
+        self.matrix_skills = matrix_skills
+        # May be precomputed, e.g. encoded together with resumes in one batch
+        self._jd_embedding = jd_embedding
+        # How scored resume embeddings are kept: 'float32', 'float16' or 'int8' (see EmbeddingStore)
+        self.embedding_dtype = embedding_dtype
+        # Kept by get_ranked_candidates() so `rerank` never re-reads resume text
+        self.skill_matrix = None
+        self.resume_embeddings = None
+        self.semantic_scores = None
+
+    @property
+    def model(self):
+        """
+        The sentence encoder, loaded on first use. It is shared across rankers so it
+        is only loaded once per process, and keyword-only ranking never imports it.
+        """
+        if self._model is None:
+            self._model = get_sentence_model()
+        return self._model
+
+    def _get_jd_embedding(self):
+        """Encodes the JD on first use and reuses it for every candidate."""
+        if self._jd_embedding is None:
+            with span('CandidateRanker.encode_jd', chars=len(self.jd_text)):
+                self._jd_embedding = self.model.encode(self.jd_text)
+        return self._jd_embedding
 
     def _calculate_keyword_score(self, resume_text):
         """
         Calculates the keyword match score using a more forgiving method
         and returns the skills that were found.
         """
-        score = 0
-        matched_skills = []
-        # Convert resume to lowercase once to make matching faster
-        resume_text_lower = resume_text.lower()
-        for skill, weight in self.skill_weights.items():
-            # A simpler, more robust check for the skill's presence.
-            # The \b ensures we match whole words only (e.g., 'java' not 'javascript').
-            if re.search(r'\b' + re.escape(skill.lower()) + r'\b', resume_text_lower):
-                score += weight
-                matched_skills.append(skill)
+        # A single scan finds every weighted skill as a whole word (e.g., 'java' not 'javascript')
+        matched_skills = get_skill_index(self.skill_weights, SKILL_ALIASES).find(resume_text)
+        score = sum(self.skill_weights[skill] for skill in matched_skills)
         return score, matched_skills
 
     def _calculate_semantic_score(self, resume_text):
         """Calculates the semantic similarity score."""
-        jd_embedding = self.model.encode(self.jd_text, convert_to_tensor=True)
-        resume_embedding = self.model.encode(resume_text, convert_to_tensor=True)
-        semantic_score = util.pytorch_cos_sim(jd_embedding, resume_embedding)
+        from sentence_transformers import util
+        resume_embedding = self.model.encode(resume_text)
+        semantic_score = util.pytorch_cos_sim(self._get_jd_embedding(), resume_embedding)
         return semantic_score.item() * 100
 
-    def get_ranked_candidates(self):
-        """Ranks candidates and includes the list of matched skills."""
-        if not self.candidate_data:
+    def encode_resumes(self, resume_texts):
+        """Encodes resumes in batches of `batch_size` and returns a (n, dim) float32 array."""
+        with span('CandidateRanker.encode_resumes', resumes=len(resume_texts), chars=sum(map(len, resume_texts))):
+            return np.asarray(self.model.encode(resume_texts, batch_size=self.batch_size), dtype=np.float32)
+
+    def _calculate_semantic_scores(self, resume_texts, resume_embeddings=None):
+        """
+        Calculates the semantic similarity score for many resumes at once.
+        The JD is encoded a single time, resumes are encoded in batches of
+        `batch_size` (unless their embeddings are passed in, e.g. from the cache,
+        as an array or an EmbeddingStore), and all similarities come from one
+        cosine-similarity matrix.
+        """
+        if not resume_texts:
             return []
+        if resume_embeddings is None:
+            resume_embeddings = self.encode_resumes(resume_texts)
+        if not isinstance(resume_embeddings, EmbeddingStore):
+            resume_embeddings = EmbeddingStore.stack(resume_embeddings, self.embedding_dtype)
+        jd_embedding = self._get_jd_embedding()
+        with span('CandidateRanker.similarity', resumes=len(resume_texts), dtype=resume_embeddings.dtype):
+            return resume_embeddings.similarity(jd_embedding)[0].tolist()
+
+    def _score_candidates(self, candidates, drop_text=False, keep_pool=True):
+        """
+        Adds keyword, semantic and final scores to each candidate in place.
+        With `drop_text`, each resume text is released as soon as it has been scored.
+        With `keep_pool`, the skill matrix and embeddings are kept for `rerank`.
+        """
+        if not candidates:
+            return candidates
+
+        resume_texts = [candidate['resume_text'] for candidate in candidates]
+        embeddings, semantic_scores = self._embed_and_compare(candidates, resume_texts)
+
+        # Every resume is scanned once into a sparse candidate x skill matrix
+        with span('CandidateRanker.keyword_scores', resumes=len(candidates)):
+            skill_matrix = SkillMatrix(
+                resume_texts, self.skill_weights if self.matrix_skills is None else self.matrix_skills
+            )
+        del resume_texts
+        if drop_text:
+            for candidate in candidates:
+                del candidate['resume_text']
+        if keep_pool:
+            self.skill_matrix = skill_matrix
+            self.resume_embeddings = embeddings
+            self.semantic_scores = semantic_scores
+        return self._apply_scores(candidates, skill_matrix, semantic_scores)
+
+    def _embed_and_compare(self, candidates, resume_texts):
+        """
+        Returns (EmbeddingStore, semantic scores) for a chunk of candidates.
+        Precomputed embeddings (e.g. from the resume cache) are reused and the rest
+        are encoded up front in batches instead of one at a time.
+        """
+        embeddings = [candidate.pop('resume_embedding', None) for candidate in candidates]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            for i, embedding in zip(missing, self.encode_resumes([resume_texts[i] for i in missing])):
+                embeddings[i] = embedding
+        embeddings = EmbeddingStore.stack(embeddings, self.embedding_dtype)
+        return embeddings, np.asarray(self._calculate_semantic_scores(resume_texts, embeddings))
+
+    def _apply_scores(self, candidates, skill_matrix, semantic_scores):
+        """Writes the scores for the current skill weights; keyword scores are one sparse product."""
+        keyword_scores = skill_matrix.keyword_scores(self.skill_weights)
+        matched_skills = skill_matrix.matched_skills(self.skill_weights)
 
-        for candidate in self.candidate_data:
-            resume_text = candidate['resume_text']
-            
-            keyword_score, matched_skills = self._calculate_keyword_score(resume_text)
-            semantic_score = self._calculate_semantic_score(resume_text)
-            
+        if semantic_scores is None:
+            # Keyword-only ranking: the keyword score is the final score
+            final_scores = keyword_scores
+        else:
             # Weighted final score (70% keyword, 30% semantic)
-            final_score = (0.7 * keyword_score) + (0.3 * semantic_score)
+            final_scores = (0.7 * keyword_scores) + (0.3 * semantic_scores)
+
+        for i, candidate in enumerate(candidates):
+            candidate['keyword_score'] = round(keyword_scores[i].item(), 2)
+            if semantic_scores is not None:
+                candidate['semantic_score'] = round(float(semantic_scores[i]), 2)
+            candidate['final_score'] = round(final_scores[i].item(), 2)
+            candidate['matched_skills'] = matched_skills[i]
+        return candidates
+
+    def rerank(self, skill_weights, jd_text=None):
+        """
+        Re-ranks the pool scored by the last get_ranked_candidates() call with new
+        skill weights (and optionally a new JD) without touching any resume text.
+        A new JD costs one JD encode and one similarity product.
 
-            candidate['keyword_score'] = round(keyword_score, 2)
-            candidate['semantic_score'] = round(semantic_score, 2)
-            candidate['final_score'] = round(final_score, 2)
-            candidate['matched_skills'] = matched_skills
+        Args:
+            skill_weights (dict): {skill: weight}; every skill must be one of `matrix_skills`.
+            jd_text (str): Optional new job description.
+
+        Returns:
+            list: Candidates ranked by their new final score.
+        """
+        if self.skill_matrix is None:
+            raise RuntimeError("get_ranked_candidates() has to run before rerank().")
+        self.skill_weights = skill_weights
+        if jd_text is not None and jd_text != self.jd_text:
+            self.jd_text = jd_text
+            self._jd_embedding = None
+            if self.resume_embeddings is not None:
+                jd_embedding = self._get_jd_embedding()
+                with span('CandidateRanker.similarity', resumes=len(self.candidate_data)):
+                    self.semantic_scores = self.resume_embeddings.similarity(jd_embedding)[0]
+        self._apply_scores(self.candidate_data, self.skill_matrix, self.semantic_scores)
+        return sorted(self.candidate_data, key=lambda x: x['final_score'], reverse=True)
+
+    def get_ranked_candidates(self, drop_text=False):
+        """
+        Ranks candidates and includes the list of matched skills.
+        With `drop_text`, resume texts are released once scored (`rerank` still works).
+        """
+        if not self.candidate_data:
+            return []
+
+        self._score_candidates(self.candidate_data, drop_text=drop_text)
 
         ranked_candidates = sorted(
             self.candidate_data, 
             key=lambda x: x['final_score'], 
             reverse=True
         )
-        return ranked_candidates
\ No newline at end of file
+        return ranked_candidates
+
+    def stream_ranked_candidates(self, candidates, top_k=None, chunk_size=256, on_scored=None):
+        """
+        Ranks an iterator of candidates with bounded memory.
+
+        Candidates are scored `chunk_size` at a time and their resume text is
+        dropped right after scoring. Only the best `top_k` are kept, in a heap.
+
+        Args:
+            candidates (iterable): Candidate dicts, e.g. a generator over the resume folder.
+            top_k (int): How many of the best candidates to return. None keeps all of them.
+            chunk_size (int): Candidates scored (and embedded) per batch.
+            on_scored (callable): Called with every scored row as soon as it is ready,
+                e.g. to append it to a CSV/JSONL file.
+
+        Returns:
+            list: The top-k candidates, best first (ties keep their input order).
+        """
+        heap = []
+        sequence = 0
+        candidates = iter(candidates)
+        while True:
+            chunk = list(islice(candidates, chunk_size))
+            if not chunk:
+                break
+            for candidate in self._score_candidates(chunk, drop_text=True, keep_pool=False):
+                if on_scored is not None:
+                    on_scored(candidate)
+                # The negated sequence number breaks score ties in favour of earlier rows
+                entry = (candidate['final_score'], -sequence, candidate)
+                sequence += 1
+                if top_k is None or len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+        return [candidate for _, _, candidate in sorted(heap, reverse=True)]
+
+
+class KeywordRanker(CandidateRanker):
+    """
+    Ranks on keyword score alone, for quick triage runs and cold-started workers.
+    No encoder is loaded and torch / sentence-transformers are never imported;
+    `final_score` is the keyword score and there is no `semantic_score`.
+    """
+
+    def __init__(self, candidate_data, skill_weights, jd_text=None, matrix_skills=None):
+        super().__init__(candidate_data, skill_weights, jd_text, matrix_skills=matrix_skills)
+
+    def _embed_and_compare(self, candidates, resume_texts):
+        for candidate in candidates:
+            candidate.pop('resume_embedding', None)
+        return None, None
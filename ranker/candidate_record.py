@@ -0,0 +1,70 @@
+from collections.abc import MutableMapping
+
+# Columns every ranked row can have, in the order they are written out
+FIELDS = (
+    'name', 'email', 'resume_text', 'filename', 'resume_embedding',
+    'keyword_score', 'semantic_score', 'final_score', 'matched_skills',
+)
+_FIELD_SET = frozenset(FIELDS)
+
+
+class CandidateRecord(MutableMapping):
+    """
+    One candidate in a ranking run.
+
+    It reads and writes like the dict rows the rankers, pandas and the result
+    writer already use, but the usual columns live in slots instead of a
+    per-row hash table, which is most of a small dict's size. Unset columns
+    are simply absent, as with `del row[key]`. Any other column (e.g.
+    'cluster_size') goes into a small dict that only exists once one is set,
+    and is listed after the fixed ones.
+    """
+
+    __slots__ = FIELDS + ('_extra',)
+
+    def __init__(self, **columns):
+        self._extra = None
+        for key, value in columns.items():
+            self[key] = value
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key in _FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in _FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for key in FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"CandidateRecord({dict(self)!r})"
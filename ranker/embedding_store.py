@@ -0,0 +1,89 @@
+"""
+Compact storage for resume embeddings.
+
+'float32' keeps the encoder output unchanged and scores it exactly as before.
+'float16' halves it. 'int8' scales each vector so its largest component is
+127, a quarter of the float32 size. Only cosine similarity is ever computed
+on resume vectors, so their length doesn't matter. For the compact dtypes,
+each vector keeps one float32 scale that brings it back to unit length.
+Similarities are computed from the stored arrays a block of rows at a time,
+so the pool is never expanded to float32 as a whole.
+"""
+import numpy as np
+
+EMBEDDING_DTYPES = ('float32', 'float16', 'int8')
+
+# Rows converted to float32 at a time when scoring a compact store
+_BLOCK_ROWS = 4096
+
+
+def quantize(embeddings, dtype='float32'):
+    """
+    Converts one (dim,) vector or a (n, dim) matrix to the storage dtype.
+    Input that already has that dtype is returned unchanged.
+    """
+    if dtype not in EMBEDDING_DTYPES:
+        raise ValueError(f"Unknown embedding dtype {dtype!r}; use one of {', '.join(EMBEDDING_DTYPES)}")
+    embeddings = np.asarray(embeddings)
+    if embeddings.dtype == np.dtype(dtype):
+        return embeddings
+    embeddings = embeddings.astype(np.float32)
+    if dtype != 'int8':
+        return embeddings.astype(dtype)
+    peaks = np.abs(embeddings).max(axis=-1, keepdims=True)
+    peaks[peaks == 0] = 1
+    return np.round(embeddings * (127 / peaks)).astype(np.int8)
+
+
+class EmbeddingStore:
+    """A (n, dim) matrix of resume embeddings in one storage dtype."""
+
+    def __init__(self, values):
+        self.values = values
+        self.dtype = values.dtype.name
+        if self.dtype == 'float32':
+            self.scales = None
+        else:
+            # 1 / length of each stored row; 0 for an all-zero row, whose similarity is 0
+            norms = np.concatenate([
+                np.linalg.norm(values[start:start + _BLOCK_ROWS].astype(np.float32), axis=1)
+                for start in range(0, len(values), _BLOCK_ROWS)
+            ] or [np.zeros(0, dtype=np.float32)])
+            self.scales = np.divide(1, norms, out=np.zeros_like(norms), where=norms > 0)
+
+    @classmethod
+    def stack(cls, embeddings, dtype='float32'):
+        """Builds a store from a list of per-resume vectors (float32 or already in `dtype`)."""
+        return cls(np.vstack([quantize(embedding, dtype) for embedding in embeddings]))
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def similarity(self, queries):
+        """
+        Cosine similarity of every stored resume to each query, scaled to 0-100.
+
+        Args:
+            queries: One (dim,) JD embedding or a (q, dim) matrix of them.
+
+        Returns:
+            np.ndarray: (q, n) float64 scores.
+        """
+        if self.scales is None:
+            from sentence_transformers import util
+            similarities = util.pytorch_cos_sim(queries, self.values).tolist()
+            return np.asarray([[score * 100 for score in row] for row in similarities])
+
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        query_norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = np.divide(queries, query_norms, out=np.zeros_like(queries), where=query_norms > 0)
+        scores = np.empty((len(queries), len(self.values)), dtype=np.float64)
+        for start in range(0, len(self.values), _BLOCK_ROWS):
+            stop = start + _BLOCK_ROWS
+            block = self.values[start:stop].astype(np.float32)
+            scores[:, start:stop] = (queries @ block.T) * self.scales[start:stop]
+        return scores * 100
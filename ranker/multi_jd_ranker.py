@@ -0,0 +1,128 @@
+import numpy as np
+from utils.model_registry import get_sentence_model
+from utils.instrumentation import span
+from utils.skill_extractor import extract_skills_from_jd
+from ranker.skill_matrix import SkillMatrix
+from ranker.embedding_store import EmbeddingStore
+
+class MultiJDRanker:
+    """
+    Ranks one pool of resumes against many job descriptions in a single pass.
+
+    Each JD's skills are extracted once, every resume is embedded and scanned
+    for skills once, and all semantic scores come from one resume x JD
+    similarity matrix. Scores match what a separate CandidateRanker run per JD
+    would give.
+    """
+
+    def __init__(self, candidate_data, jds, model=None, batch_size=32, embedding_dtype='float32'):
+        """
+        Args:
+            candidate_data (list): Candidate dicts with 'resume_text' and, optionally, a
+                precomputed 'resume_embedding'.
+            jds (dict): {jd_name: jd_text}. JDs without any known skills are left out
+                (see `skipped_jds`).
+            model: Sentence encoder; defaults to the shared one.
+            batch_size (int): Texts per encoder forward pass.
+            embedding_dtype (str): 'float32', 'float16' or 'int8' storage for resume embeddings.
+        """
+        self.candidate_data = candidate_data
+        self._model = model
+        self.batch_size = batch_size
+        self.embedding_dtype = embedding_dtype
+
+        self.jd_texts = {}
+        self.skill_weights = {}
+        self.skipped_jds = []
+        for jd_name, jd_text in jds.items():
+            jd_skills, skill_weights = extract_skills_from_jd(jd_text)
+            if jd_skills:
+                self.jd_texts[jd_name] = jd_text
+                self.skill_weights[jd_name] = skill_weights
+            else:
+                self.skipped_jds.append(jd_name)
+
+    @property
+    def model(self):
+        """The shared sentence encoder, loaded on first use."""
+        if self._model is None:
+            self._model = get_sentence_model()
+        return self._model
+
+    def encode_resumes(self, resume_texts):
+        """Encodes resumes in batches of `batch_size` and returns a (n, dim) float32 array."""
+        with span('MultiJDRanker.encode_resumes', resumes=len(resume_texts), chars=sum(map(len, resume_texts))):
+            return np.asarray(self.model.encode(resume_texts, batch_size=self.batch_size), dtype=np.float32)
+
+    def _calculate_semantic_matrix(self, resume_embeddings):
+        """Returns the resume x JD cosine similarities of an EmbeddingStore, scaled to 0-100."""
+        jd_texts = list(self.jd_texts.values())
+        with span('MultiJDRanker.encode_jds', jds=len(jd_texts), chars=sum(map(len, jd_texts))):
+            jd_embeddings = self.model.encode(jd_texts, batch_size=self.batch_size)
+        with span('MultiJDRanker.similarity', resumes=len(resume_embeddings), jds=len(jd_texts)):
+            return resume_embeddings.similarity(jd_embeddings).T
+
+    def get_ranked_candidates(self):
+        """
+        Scores every candidate against every JD.
+
+        Returns:
+            tuple: ({jd_name: ranked candidate rows, best first}, [one summary row per candidate]).
+                A summary row has a 'score:<jd_name>' column per JD, so no JD name can
+                overwrite a candidate column. Every row carries the candidate's
+                'best_fit_jd' and 'best_fit_score'.
+        """
+        if not self.candidate_data or not self.jd_texts:
+            return {}, []
+
+        resume_texts = [candidate['resume_text'] for candidate in self.candidate_data]
+        embeddings = [candidate.get('resume_embedding') for candidate in self.candidate_data]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            for i, embedding in zip(missing, self.encode_resumes([resume_texts[i] for i in missing])):
+                embeddings[i] = embedding
+        semantic_matrix = self._calculate_semantic_matrix(EmbeddingStore.stack(embeddings, self.embedding_dtype))
+        del embeddings
+
+        # One scan per resume over the union of all JD skills; keyword scores for
+        # every JD then come from one sparse (resumes x skills) @ (skills x JDs) product.
+        jd_names = list(self.jd_texts)
+        all_skills = list(dict.fromkeys(skill for weights in self.skill_weights.values() for skill in weights))
+        with span('MultiJDRanker.keyword_scores', resumes=len(resume_texts)):
+            skill_matrix = SkillMatrix(resume_texts, all_skills)
+            keyword_matrix = skill_matrix.matrix @ np.column_stack(
+                [skill_matrix.weight_vector(self.skill_weights[jd_name]) for jd_name in jd_names]
+            )
+            matched_by_jd = [skill_matrix.matched_skills(self.skill_weights[jd_name]) for jd_name in jd_names]
+
+        # Weighted final scores (70% keyword, 30% semantic)
+        final_matrix = (0.7 * keyword_matrix) + (0.3 * semantic_matrix)
+
+        rows_by_jd = {jd_name: [] for jd_name in jd_names}
+        summaries = []
+        for i, candidate in enumerate(self.candidate_data):
+            base = {key: value for key, value in candidate.items() if key not in ('resume_text', 'resume_embedding')}
+            summary = dict(base)
+            for j, jd_name in enumerate(jd_names):
+                rows_by_jd[jd_name].append({
+                    **base,
+                    'keyword_score': round(keyword_matrix[i, j].item(), 2),
+                    'semantic_score': round(float(semantic_matrix[i, j]), 2),
+                    'final_score': round(float(final_matrix[i, j]), 2),
+                    'matched_skills': matched_by_jd[j][i],
+                })
+                summary[f"score:{jd_name}"] = round(float(final_matrix[i, j]), 2)
+
+            # Ties go to the JD listed first
+            best_fit_jd = max(jd_names, key=lambda jd_name: summary[f"score:{jd_name}"])
+            summary['best_fit_jd'] = best_fit_jd
+            summary['best_fit_score'] = summary[f"score:{best_fit_jd}"]
+            summaries.append(summary)
+
+        ranked_by_jd = {}
+        for jd_name, rows in rows_by_jd.items():
+            for row, summary in zip(rows, summaries):
+                row['best_fit_jd'] = summary['best_fit_jd']
+                row['best_fit_score'] = summary['best_fit_score']
+            ranked_by_jd[jd_name] = sorted(rows, key=lambda x: x['final_score'], reverse=True)
+        return ranked_by_jd, summaries
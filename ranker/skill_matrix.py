@@ -0,0 +1,65 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from utils.skill_extractor import SKILL_DB, SKILL_ALIASES
+from utils.skill_index import get_skill_index
+
+class SkillMatrix:
+    """
+    Sparse candidate x skill occurrence matrix for a pool of resumes.
+
+    Each resume is scanned for skills once when the matrix is built. After that,
+    keyword scores for any set of skill weights are a single sparse
+    matrix-vector product, so a new JD or re-weighted skills never need the
+    resume text again.
+    """
+
+    def __init__(self, resume_texts, skills=None, aliases=SKILL_ALIASES):
+        """
+        Args:
+            resume_texts (iterable): One text per candidate, in candidate order.
+            skills (iterable): Skills to track (the columns). Defaults to SKILL_DB, which
+                covers every skill a JD can be given by extract_skills_from_jd.
+            aliases (dict): Alias -> canonical skill, as in SKILL_ALIASES.
+        """
+        self.skills = list(dict.fromkeys(SKILL_DB if skills is None else skills))
+        self._columns = {skill: i for i, skill in enumerate(self.skills)}
+        skill_index = get_skill_index(self.skills, aliases)
+
+        # CSR arrays are filled directly; `find` returns skills in column order
+        indices = []
+        indptr = [0]
+        for text in resume_texts:
+            indices.extend(self._columns[skill] for skill in skill_index.find(text))
+            indptr.append(len(indices))
+        self.matrix = csr_matrix(
+            (np.ones(len(indices), dtype=np.int8), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, len(self.skills))
+        )
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def weight_vector(self, skill_weights):
+        """Turns {skill: weight} into a dense vector over the matrix's columns."""
+        unknown = [skill for skill in skill_weights if skill not in self._columns]
+        if unknown:
+            raise ValueError(f"Skills not covered by this matrix: {', '.join(unknown)}")
+        # Integer weights (the usual case) keep integer keyword scores
+        integral = all(isinstance(weight, (int, np.integer)) for weight in skill_weights.values())
+        weights = np.zeros(len(self.skills), dtype=np.int64 if integral else np.float64)
+        for skill, weight in skill_weights.items():
+            weights[self._columns[skill]] = weight
+        return weights
+
+    def keyword_scores(self, skill_weights):
+        """Returns every candidate's keyword score (sum of the weights of its matched skills)."""
+        return self.matrix @ self.weight_vector(skill_weights)
+
+    def matched_skills(self, skill_weights):
+        """Returns, per candidate, the weighted skills it mentions, in `skill_weights` order."""
+        columns = [self._columns[skill] for skill in skill_weights]
+        matched = []
+        for row in range(len(self)):
+            present = set(self.matrix.indices[self.matrix.indptr[row]:self.matrix.indptr[row + 1]].tolist())
+            matched.append([skill for skill, column in zip(skill_weights, columns) if column in present])
+        return matched
@@ -0,0 +1,238 @@
+import json
+import os
+import sqlite3
+
+import numpy as np
+
+EMBEDDINGS_FILE = 'embeddings.f32'
+METADATA_FILE = 'metadata.sqlite3'
+CENTROIDS_FILE = 'ivf_centroids.npy'
+ASSIGNMENTS_FILE = 'ivf_assignments.i32'
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class ResumeIndex:
+    """
+    A persistent embedding index over a resume corpus.
+
+    Vectors live in a flat float32 file that is memory-mapped for search, and
+    the per-row ID and candidate details live in a SQLite sidecar. Rows are
+    appended, so the index can be grown incrementally. An optional IVF layer
+    (spherical k-means centroids) lets queries scan only the closest clusters.
+    """
+
+    def __init__(self, index_dir):
+        self.index_dir = index_dir
+        os.makedirs(index_dir, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(index_dir, METADATA_FILE))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            " row_id INTEGER PRIMARY KEY, content_hash TEXT UNIQUE, filename TEXT, details TEXT)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS info (name TEXT PRIMARY KEY, value TEXT)")
+        self._conn.commit()
+        self._vectors = None
+        self._centroids = None
+        self._assignments = None
+
+    # --- Bookkeeping ---
+
+    def _get_info(self, name, default=None):
+        row = self._conn.execute("SELECT value FROM info WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_info(self, name, value):
+        self._conn.execute("INSERT OR REPLACE INTO info (name, value) VALUES (?, ?)", (name, json.dumps(value)))
+
+    def _path(self, filename):
+        return os.path.join(self.index_dir, filename)
+
+    @property
+    def dim(self):
+        return self._get_info('dim')
+
+    def __len__(self):
+        return self._get_info('count', 0)
+
+    def _truncate(self, filename, size):
+        """Drops anything past `size` bytes, i.e. data written by an add() that never committed."""
+        path = self._path(filename)
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            os.truncate(path, size)
+
+    def contains(self, content_hash):
+        return self._conn.execute(
+            "SELECT 1 FROM resumes WHERE content_hash = ?", (content_hash,)
+        ).fetchone() is not None
+
+    # --- Building ---
+
+    def add(self, entries):
+        """
+        Appends new resumes to the index. Entries whose hash is already indexed are skipped.
+
+        Args:
+            entries (iterable): (content_hash, filename, details, embedding) tuples.
+
+        Returns:
+            int: Number of rows added.
+        """
+        count = len(self)
+        dim = self.dim
+        rows = []
+        vectors = []
+        seen = set()
+        for content_hash, filename, details, embedding in entries:
+            if content_hash in seen or self.contains(content_hash):
+                continue
+            seen.add(content_hash)
+            embedding = np.asarray(embedding, dtype=np.float32).ravel()
+            if dim is None:
+                dim = embedding.shape[0]
+            elif embedding.shape[0] != dim:
+                raise ValueError(f"Embedding has {embedding.shape[0]} dimensions, index expects {dim}")
+            rows.append((count + len(rows), content_hash, filename, json.dumps(details)))
+            vectors.append(embedding)
+        if not rows:
+            return 0
+
+        vectors = _normalize(np.vstack(vectors))
+        # Vectors are appended before the metadata commit, so a crash in between leaves
+        # uncommitted bytes at the end of the files; cut them off so row i stays at offset i
+        self._vectors = None
+        self._assignments = None
+        self._truncate(EMBEDDINGS_FILE, count * dim * 4)
+        with open(self._path(EMBEDDINGS_FILE), 'ab') as f:
+            f.write(vectors.tobytes())
+        if self._has_ivf():
+            self._truncate(ASSIGNMENTS_FILE, count * 4)
+            assignments = np.argmax(vectors @ self._load_centroids().T, axis=1).astype(np.int32)
+            with open(self._path(ASSIGNMENTS_FILE), 'ab') as f:
+                f.write(assignments.tobytes())
+
+        self._conn.executemany(
+            "INSERT INTO resumes (row_id, content_hash, filename, details) VALUES (?, ?, ?, ?)", rows
+        )
+        self._set_info('dim', int(dim))
+        self._set_info('count', count + len(rows))
+        self._conn.commit()
+        self._vectors = None
+        self._assignments = None
+        return len(rows)
+
+    def build_ivf(self, n_lists=None, iterations=10, sample_size=20000, seed=0):
+        """
+        Clusters the stored vectors with spherical k-means so queries can probe
+        only the closest `n_probe` clusters instead of scanning every row.
+        """
+        vectors = self.vectors()
+        if len(vectors) == 0:
+            return
+        n_lists = min(n_lists or max(1, int(np.sqrt(len(vectors)))), len(vectors))
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(len(vectors), size=min(sample_size, len(vectors)), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for cluster in range(n_lists):
+                members = sample[labels == cluster]
+                if len(members):
+                    centroids[cluster] = members.sum(axis=0)
+            centroids = _normalize(centroids)
+
+        assignments = np.concatenate([
+            np.argmax(vectors[start:start + 8192] @ centroids.T, axis=1)
+            for start in range(0, len(vectors), 8192)
+        ]).astype(np.int32)
+        np.save(self._path(CENTROIDS_FILE), centroids)
+        assignments.tofile(self._path(ASSIGNMENTS_FILE))
+        self._centroids = None
+        self._assignments = None
+
+    # --- Searching ---
+
+    def vectors(self):
+        """Returns the (count, dim) matrix of normalized embeddings, memory-mapped from disk."""
+        count = len(self)
+        if count == 0:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        if self._vectors is None or len(self._vectors) != count:
+            self._vectors = np.memmap(self._path(EMBEDDINGS_FILE), dtype=np.float32, mode='r', shape=(count, self.dim))
+        return self._vectors
+
+    def _has_ivf(self):
+        return os.path.exists(self._path(CENTROIDS_FILE))
+
+    def _load_centroids(self):
+        if self._centroids is None:
+            self._centroids = np.load(self._path(CENTROIDS_FILE))
+        return self._centroids
+
+    def _load_assignments(self):
+        if self._assignments is None:
+            self._assignments = np.fromfile(self._path(ASSIGNMENTS_FILE), dtype=np.int32)
+        return self._assignments
+
+    def search(self, query_embedding, k=10, n_probe=None):
+        """
+        Finds the k rows most similar to the query.
+
+        Args:
+            query_embedding: The JD embedding.
+            k (int): Number of results.
+            n_probe (int): Clusters to scan when an IVF layer exists. None scans every row.
+
+        Returns:
+            tuple: (row_ids, similarities), both sorted by descending similarity.
+        """
+        vectors = self.vectors()
+        if len(vectors) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        query = _normalize(query_embedding).ravel()
+
+        if n_probe and self._has_ivf():
+            centroids = self._load_centroids()
+            probes = np.argsort(-(centroids @ query))[:n_probe]
+            row_ids = np.flatnonzero(np.isin(self._load_assignments(), probes))
+            scores = vectors[row_ids] @ query
+        else:
+            row_ids = None
+            scores = vectors @ query
+
+        k = min(k, len(scores))
+        if k == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        # argpartition avoids sorting every score when only the top k matter
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        ids = top if row_ids is None else row_ids[top]
+        return ids, scores[top]
+
+    def get_records(self, row_ids):
+        """Returns the stored filename, details and embedding for each row, in the given order."""
+        row_ids = [int(row_id) for row_id in row_ids]
+        records = {}
+        for start in range(0, len(row_ids), 500):
+            chunk = row_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for row_id, content_hash, filename, details in self._conn.execute(
+                f"SELECT row_id, content_hash, filename, details FROM resumes WHERE row_id IN ({placeholders})", chunk
+            ):
+                records[row_id] = {
+                    'content_hash': content_hash,
+                    'filename': filename,
+                    'details': json.loads(details),
+                }
+        vectors = self.vectors()
+        for row_id in row_ids:
+            records[row_id]['embedding'] = np.array(vectors[row_id])
+        return [records[row_id] for row_id in row_ids]
+
+    def close(self):
+        self._conn.close()
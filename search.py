@@ -0,0 +1,159 @@
+"""
+Top-k resume search over a persistent embedding index.
+
+Build (or grow) the index from a folder of PDFs; only new files are processed:
+    python search.py build --resumes-dir data/resumes/ --index-dir index/ --ivf-lists 256
+
+Find the best candidates for a JD:
+    python search.py query --jd data/job_description.txt -k 10 --n-probe 16
+"""
+import argparse
+import hashlib
+import os
+
+import pandas as pd
+
+from ranker.candidate_ranker import CandidateRanker
+from ranker.vector_index import ResumeIndex
+from utils.file_loader import load_jd
+from utils.ingestion import ingest_resumes
+from utils.model_registry import get_sentence_model
+from utils.skill_extractor import extract_skills_from_jd
+
+DEFAULT_INDEX_DIR = 'index'
+
+
+def build_index(resumes_dir, index_dir=DEFAULT_INDEX_DIR, workers=None, batch_size=32, chunk_size=1000, ivf_lists=None):
+    """
+    Adds every PDF in `resumes_dir` that isn't indexed yet (by content hash).
+
+    Returns:
+        int: Number of resumes added.
+    """
+    index = ResumeIndex(index_dir)
+    resume_files = sorted(f for f in os.listdir(resumes_dir) if f.endswith('.pdf'))
+
+    new_files = []
+    hashes = {}
+    for filename in resume_files:
+        with open(os.path.join(resumes_dir, filename), 'rb') as f:
+            content_hash = hashlib.sha256(f.read()).hexdigest()
+        if not index.contains(content_hash):
+            new_files.append(filename)
+            hashes[filename] = content_hash
+    print(f"{len(resume_files) - len(new_files)} resumes already indexed, {len(new_files)} new.")
+
+    model = get_sentence_model()
+    added = 0
+    pending = []
+
+    def flush():
+        embeddings = model.encode([details['resume_text'] for _, details in pending], batch_size=batch_size)
+        return index.add(
+            (hashes[filename], filename, details, embedding)
+            for (filename, details), embedding in zip(pending, embeddings)
+        )
+
+    paths = [os.path.join(resumes_dir, filename) for filename in new_files]
+    for position, path, details, error in ingest_resumes(paths, workers, batch_size):
+        if error:
+            print(f"Skipping {new_files[position]}: {error}")
+            continue
+        pending.append((new_files[position], details))
+        # Encode and write in chunks so memory stays flat on large corpora
+        if len(pending) >= chunk_size:
+            added += flush()
+            pending = []
+    if pending:
+        added += flush()
+
+    if ivf_lists:
+        print(f"Clustering {len(index)} vectors into {ivf_lists} lists...")
+        index.build_ivf(ivf_lists)
+    index.close()
+    return added
+
+
+def search(jd_text, index_dir=DEFAULT_INDEX_DIR, k=10, shortlist=200, n_probe=None):
+    """
+    Returns the top-k candidates for a JD from the index.
+
+    The index narrows the corpus to a `shortlist` by embedding similarity, and
+    only those resumes go through the full keyword + semantic scoring.
+    """
+    jd_skills, skill_weights = extract_skills_from_jd(jd_text)
+    if not jd_skills:
+        return []
+
+    index = ResumeIndex(index_dir)
+    model = get_sentence_model()
+    jd_embedding = model.encode(jd_text)
+    row_ids, _ = index.search(jd_embedding, k=max(k, shortlist), n_probe=n_probe)
+
+    candidate_data = []
+    for record in index.get_records(row_ids):
+        details = record['details']
+        candidate_data.append({
+            'name': details['name'] or "Not Found",
+            'email': details['email'] or "Not Found",
+            'resume_text': details['resume_text'],
+            'filename': record['filename'],
+            'resume_embedding': record['embedding']
+        })
+    index.close()
+
+    # The shortlist query vector doubles as the ranker's JD embedding
+    ranker = CandidateRanker(candidate_data, skill_weights, jd_text, model=model, jd_embedding=jd_embedding)
+    return ranker.get_ranked_candidates()[:k]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = arg_parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="Add new resumes to the index.")
+    build_parser.add_argument('--resumes-dir', default='data/resumes/')
+    build_parser.add_argument('--index-dir', default=DEFAULT_INDEX_DIR)
+    build_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    build_parser.add_argument('--batch-size', type=int, default=32)
+    build_parser.add_argument('--ivf-lists', type=int, default=None,
+                              help="(Re)build the approximate IVF layer with this many clusters.")
+
+    query_parser = subparsers.add_parser('query', help="Rank the top-k candidates for a JD.")
+    query_parser.add_argument('--jd', default='data/job_description.txt')
+    query_parser.add_argument('--index-dir', default=DEFAULT_INDEX_DIR)
+    query_parser.add_argument('-k', '--top-k', type=int, default=10)
+    query_parser.add_argument('--shortlist', type=int, default=200,
+                              help="Candidates taken from the index for full keyword + semantic scoring.")
+    query_parser.add_argument('--n-probe', type=int, default=None,
+                              help="IVF clusters to scan (approximate). Omit for an exact scan.")
+    query_parser.add_argument('--output', default=None, help="Optional CSV path for the results.")
+
+    args = arg_parser.parse_args()
+
+    if args.command == 'build':
+        added = build_index(args.resumes_dir, args.index_dir, args.workers, args.batch_size, ivf_lists=args.ivf_lists)
+        print(f"Indexed {added} new resumes.")
+        return
+
+    jd_text = load_jd(args.jd)
+    if not jd_text:
+        print(f"Error: Job description not found at {args.jd}")
+        return
+
+    ranked_candidates = search(jd_text, args.index_dir, args.top_k, args.shortlist, args.n_probe)
+    if not ranked_candidates:
+        print("No matching candidates (or no skills found in the job description).")
+        return
+
+    df = pd.DataFrame(ranked_candidates)
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        df.to_csv(args.output, index=False)
+        print(f"Results saved to {args.output}")
+    else:
+        print(df[['name', 'email', 'filename', 'keyword_score', 'semantic_score', 'final_score']].to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
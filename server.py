@@ -0,0 +1,320 @@
+"""
+Local HTTP ranking service for programmatic callers (e.g. an ATS).
+
+Models are loaded once at startup. PDF reading and parsing run in a pool of
+worker processes, and the resume/JD texts of concurrent requests are encoded
+together in micro-batches.
+
+Start it:
+    python server.py --port 8000 --workers 4 --max-batch-size 64 --max-wait-ms 10
+
+Endpoints:
+    POST /rank     {"jd_text": "...", "resumes": [{"filename": "a.pdf", "pdf_base64": "..."}
+                    or {"filename": "b.txt", "text": "..."}], "top_k": 10, "mode": "hybrid" | "keyword"}
+    GET  /health   Liveness and whether the models are loaded.
+    GET  /metrics  Request counts, latency percentiles, batching and worker-pool stats.
+"""
+import argparse
+import base64
+import binascii
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import get_context
+
+import numpy as np
+
+from parser.resume_parser import ResumeParser, get_lean_nlp
+from ranker.candidate_ranker import CandidateRanker, KeywordRanker
+from utils.micro_batcher import MicroBatcher
+from utils.model_registry import get_sentence_model
+from utils.pdf_reader import read_pdf
+from utils.resume_cache import ResumeCache, DEFAULT_CACHE_PATH
+from utils.skill_extractor import extract_skills_from_jd
+
+# Request bodies larger than this are refused
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+
+def _init_worker():
+    # Each parsing process loads the NER pipeline once, before its first request
+    get_lean_nlp()
+
+
+def _warm_worker():
+    return os.getpid()
+
+
+def _parse_resume(pdf_bytes, text, regex_only):
+    """Worker task: reads a PDF (or takes plain text) and returns get_details(), or None if unreadable."""
+    if pdf_bytes is not None:
+        text = read_pdf(pdf_bytes)
+    if not text:
+        return None
+    return ResumeParser(text, lean=True, regex_only=regex_only).get_details()
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def validate_request(payload):
+    """
+    Checks a /rank request body before any work is done.
+
+    Returns:
+        tuple: (jd_text, [(filename, pdf_bytes or None, text or None), ...], mode, top_k).
+
+    Raises:
+        BadRequest: The body is malformed; its message says which field.
+    """
+    if not isinstance(payload, dict):
+        raise BadRequest("The request body must be a JSON object.")
+    jd_text = payload.get('jd_text')
+    raw_resumes = payload.get('resumes')
+    mode = payload.get('mode', 'hybrid')
+    top_k = payload.get('top_k')
+    if not isinstance(jd_text, str) or not jd_text.strip() or not isinstance(raw_resumes, list) or not raw_resumes:
+        raise BadRequest("'jd_text' and a non-empty 'resumes' list are required.")
+    if mode not in ('hybrid', 'keyword'):
+        raise BadRequest("'mode' must be 'hybrid' or 'keyword'.")
+    if top_k is not None and (not isinstance(top_k, int) or isinstance(top_k, bool) or top_k < 0):
+        raise BadRequest("'top_k' must be a non-negative integer.")
+
+    resumes = []
+    for i, resume in enumerate(raw_resumes):
+        if not isinstance(resume, dict):
+            raise BadRequest(f"Resume {i} must be an object.")
+        filename = resume.get('filename', f"resume_{i}")
+        pdf_base64 = resume.get('pdf_base64')
+        text = resume.get('text')
+        if not isinstance(filename, str):
+            raise BadRequest(f"Resume {i}: 'filename' must be a string.")
+        if not isinstance(pdf_base64, (str, type(None))) or not isinstance(text, (str, type(None))):
+            raise BadRequest(f"Resume {i}: 'pdf_base64' and 'text' must be strings.")
+        pdf_bytes = None
+        if pdf_base64:
+            try:
+                # Line breaks from wrapped encoders (e.g. the base64 CLI) are fine; anything else is not
+                pdf_bytes = base64.b64decode(''.join(pdf_base64.split()), validate=True)
+            except binascii.Error:
+                pdf_bytes = b''
+            if not pdf_bytes:
+                raise BadRequest(f"Resume {i}: 'pdf_base64' is not valid base64.")
+        if pdf_bytes is None and not text:
+            raise BadRequest(f"Resume {i} needs 'pdf_base64' or 'text'.")
+        resumes.append((filename, pdf_bytes, text))
+    return jd_text, resumes, mode, top_k
+
+
+class RankingService:
+    """Everything a request needs, created once and shared by all handler threads."""
+
+    def __init__(self, workers=None, max_batch_size=64, max_wait_ms=10, cache_path=DEFAULT_CACHE_PATH,
+                 use_cache=True):
+        self.workers = workers or os.cpu_count() or 1
+        self.started = time.time()
+
+        # Parsing workers are spawned (and warmed) before torch is loaded in this process
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context('spawn'),
+                                        initializer=_init_worker)
+        for future in [self.pool.submit(_warm_worker) for _ in range(self.workers)]:
+            future.result()
+
+        self.model = get_sentence_model()
+        self.batcher = MicroBatcher(
+            lambda texts: self.model.encode(texts, batch_size=max_batch_size), max_batch_size, max_wait_ms
+        )
+        self.cache = ResumeCache(cache_path) if use_cache else None
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=1000)
+        self._counts = {'requests': 0, 'errors': 0, 'resumes': 0, 'cache_hits': 0, 'in_flight': 0}
+
+    def rank(self, payload):
+        """Ranks the resumes in one /rank request body; returns the response body."""
+        jd_text, resumes, mode, top_k = validate_request(payload)
+        keyword_only = mode == 'keyword'
+
+        jd_skills, skill_weights = extract_skills_from_jd(jd_text)
+        if not jd_skills:
+            raise BadRequest("Could not extract any skills from the job description.")
+
+        # Cache hits skip the pool and the encoder; everything else is parsed in parallel
+        use_cache = self.cache is not None and not keyword_only
+        cache_keys = [
+            self.cache.key_for(pdf_bytes if pdf_bytes is not None else text.encode('utf-8')) if use_cache else None
+            for _, pdf_bytes, text in resumes
+        ]
+        found = self.cache.get_many(cache_keys) if use_cache else {}
+        entries = []
+        for (filename, pdf_bytes, text), cache_key in zip(resumes, cache_keys):
+            entry = {'filename': filename, 'details': None, 'embedding': None,
+                     'cache_key': cache_key, 'future': None, 'cached': False}
+            if use_cache:
+                hit = found.get(cache_key)
+                if hit is not None and hit[0] is not None:
+                    entry['details'], entry['embedding'] = hit
+                    entry['cached'] = True
+            if entry['details'] is None:
+                entry['future'] = self.pool.submit(_parse_resume, pdf_bytes, text, keyword_only)
+            entries.append(entry)
+
+        skipped = []
+        for entry in entries:
+            if entry['future'] is not None:
+                entry['details'] = entry.pop('future').result()
+                if entry['details'] is None:
+                    skipped.append(entry['filename'])
+        parsed = [entry for entry in entries if entry['details'] is not None]
+
+        if keyword_only:
+            ranker = KeywordRanker([], skill_weights, jd_text)
+        else:
+            # The JD and every resume without a cached vector join one micro-batch
+            missing = [entry for entry in parsed if entry['embedding'] is None]
+            embeddings = self.batcher.encode([jd_text] + [entry['details']['resume_text'] for entry in missing])
+            for entry, embedding in zip(missing, embeddings[1:]):
+                entry['embedding'] = embedding
+            if self.cache is not None and missing:
+                self.cache.put_many((entry['cache_key'], entry['details'], entry['embedding']) for entry in missing)
+            ranker = CandidateRanker([], skill_weights, jd_text, model=self.model, jd_embedding=embeddings[0])
+
+        ranker.candidate_data = [
+            {
+                'name': entry['details']['name'] or "Not Found",
+                'email': entry['details']['email'] or "Not Found",
+                'resume_text': entry['details']['resume_text'],
+                'filename': entry['filename'],
+                'resume_embedding': entry['embedding'],
+            }
+            for entry in parsed
+        ]
+        ranked_candidates = ranker.get_ranked_candidates()[:top_k]
+        for candidate in ranked_candidates:
+            del candidate['resume_text']
+
+        with self._lock:
+            self._counts['resumes'] += len(resumes)
+            self._counts['cache_hits'] += sum(1 for entry in entries if entry['cached'])
+        return {'mode': mode, 'jd_skills': jd_skills, 'ranked_candidates': ranked_candidates, 'skipped': skipped}
+
+    def record(self, seconds, error=False):
+        with self._lock:
+            self._counts['requests'] += 1
+            self._counts['errors'] += int(error)
+            self._latencies.append(seconds)
+
+    def track(self, delta):
+        with self._lock:
+            self._counts['in_flight'] += delta
+
+    def health(self):
+        return {'status': 'ok', 'models_loaded': self.model is not None, 'workers': self.workers,
+                'uptime_s': round(time.time() - self.started, 1)}
+
+    def metrics(self):
+        with self._lock:
+            counts = dict(self._counts)
+            latencies_ms = np.asarray(self._latencies) * 1000
+        latency = {}
+        if len(latencies_ms):
+            for p in (50, 95, 99):
+                latency[f"p{p}_ms"] = round(float(np.percentile(latencies_ms, p)), 2)
+        return {**self.health(), 'counts': counts, 'latency_last_1000': latency, 'encoder': self.batcher.stats()}
+
+    def close(self):
+        self.batcher.close()
+        self.pool.shutdown()
+        if self.cache is not None:
+            self.cache.close()
+
+
+class RankingHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def _send_json(self, status, body):
+        data = json.dumps(body, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, self.service.health())
+        elif self.path == '/metrics':
+            self._send_json(200, self.service.metrics())
+        else:
+            self._send_json(404, {'error': f"Unknown path {self.path}"})
+
+    def _read_json(self):
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            raise BadRequest("Invalid Content-Length header.") from None
+        if length > MAX_BODY_BYTES:
+            raise BadRequest(f"Request body is larger than {MAX_BODY_BYTES} bytes.")
+        try:
+            return json.loads(self.rfile.read(length))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise BadRequest(f"Request body is not valid JSON: {e}") from None
+
+    def do_POST(self):
+        if self.path != '/rank':
+            self._send_json(404, {'error': f"Unknown path {self.path}"})
+            return
+        start = time.perf_counter()
+        self.service.track(1)
+        status, error = 200, False
+        try:
+            body = self.service.rank(self._read_json())
+        except BadRequest as e:
+            status, error, body = 400, True, {'error': str(e)}
+        except Exception as e:
+            status, error, body = 500, True, {'error': str(e)}
+        finally:
+            self.service.track(-1)
+        self.service.record(time.perf_counter() - start, error)
+        self._send_json(status, body)
+
+    def log_message(self, format, *args):
+        # Per-request access logs would dominate the output under load
+        pass
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--host', default='127.0.0.1')
+    arg_parser.add_argument('--port', type=int, default=8000)
+    arg_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="PDF parsing processes.")
+    arg_parser.add_argument('--max-batch-size', type=int, default=64, help="Texts per encoder micro-batch.")
+    arg_parser.add_argument('--max-wait-ms', type=float, default=10,
+                            help="How long a request may wait for others to fill a micro-batch.")
+    arg_parser.add_argument('--cache-path', default=DEFAULT_CACHE_PATH)
+    arg_parser.add_argument('--no-cache', action='store_true', help="Parse and embed every resume on every request.")
+    args = arg_parser.parse_args()
+
+    print(f"Loading models and starting {args.workers} parsing worker(s)...")
+    service = RankingService(args.workers, args.max_batch_size, args.max_wait_ms, args.cache_path,
+                             use_cache=not args.no_cache)
+    RankingHandler.service = service
+    server = ThreadingHTTPServer((args.host, args.port), RankingHandler)
+    server.daemon_threads = True
+    print(f"Serving on http://{args.host}:{args.port} (POST /rank, GET /health, GET /metrics)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+import spacy
+
+from utils import ingestion
+
+
+class _FlakyParser:
+    """Stands in for ResumeParser; fails on the text 'bad resume'."""
+
+    def __init__(self, text, **kwargs):
+        if text == 'bad resume':
+            raise ValueError('bad resume')
+        self.text = text
+
+    def get_details(self):
+        return {'resume_text': self.text}
+
+
+def _parse(monkeypatch, workers):
+    monkeypatch.setattr(ingestion, 'ResumeParser', _FlakyParser)
+    monkeypatch.setattr(ingestion, 'get_lean_nlp', lambda: spacy.blank('en'))
+    texts = [(0, 'a.pdf', 'good resume', None), (1, 'b.pdf', 'bad resume', None), (2, 'c.pdf', 'another one', None)]
+    return sorted(ingestion.parse_texts(texts, workers=workers))
+
+
+def test_parse_failure_is_reported_per_file_sequentially(monkeypatch):
+    results = _parse(monkeypatch, workers=1)
+    assert [(position, error) for position, _, _, error in results] == [
+        (0, None), (1, 'parsing failed: bad resume'), (2, None)
+    ]
+
+
+def test_parse_failure_is_reported_per_file_with_workers(monkeypatch):
+    results = _parse(monkeypatch, workers=2)
+    assert [(position, error) for position, _, _, error in results] == [
+        (0, None), (1, 'parsing failed: bad resume'), (2, None)
+    ]
+    assert results[0][2] == {'resume_text': 'good resume'}
@@ -0,0 +1,135 @@
+"""
+Near-duplicate detection for resumes (the same candidate re-applying with a
+slightly edited PDF).
+
+Each text gets a MinHash signature over its word shingles; an LSH index over
+signature bands finds likely matches, which are confirmed by estimated Jaccard
+similarity. Only one representative per cluster needs parsing and embedding.
+Fingerprinting is a few hashes per word, far cheaper than the spaCy and
+encoder work it saves.
+"""
+import zlib
+
+import numpy as np
+
+from utils.instrumentation import span
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+class MinHasher:
+    """MinHash signatures over lowercase word shingles."""
+
+    def __init__(self, num_perm=64, shingle_size=3, seed=1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text):
+        words = text.lower().split()
+        k = self.shingle_size
+        return {' '.join(words[i:i + k]) for i in range(max(len(words) - k + 1, 1))}
+
+    def signature(self, text):
+        """Returns the (num_perm,) uint64 signature of a text."""
+        shingles = self.shingles(text)
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+        # One universal hash (a*x + b mod p) per permutation, applied to every shingle at once
+        with np.errstate(over='ignore'):
+            permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+
+
+class NearDuplicateIndex:
+    """
+    Clusters texts online as they arrive. The first text of a cluster is its
+    representative; a later text joins the cluster of the first representative
+    whose estimated Jaccard similarity reaches `threshold`. Clusters therefore
+    depend on the order of `add` calls, so callers add texts in a fixed order.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=64, bands=16, shingle_size=3):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self._buckets = [{} for _ in range(bands)]
+        self._signatures = {}
+        # representative key -> [representative key, member keys...]
+        self.members = {}
+        self._representative = {}
+
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, key, text=None, signature=None):
+        """
+        Fingerprints a text and files it into a cluster.
+
+        Args:
+            signature (np.ndarray): A signature from an earlier `signature()` call, instead of `text`.
+
+        Returns:
+            The key of its cluster's representative (`key` itself for a new cluster).
+        """
+        with span('fingerprint', chars=len(text or '')):
+            if signature is None:
+                signature = self.hasher.signature(text)
+            self._signatures[key] = signature
+            band_keys = self._band_keys(signature)
+
+            checked = set()
+            for band, band_key in enumerate(band_keys):
+                for candidate in self._buckets[band].get(band_key, ()):
+                    if candidate in checked:
+                        continue
+                    checked.add(candidate)
+                    if np.mean(self._signatures[candidate] == signature) >= self.threshold:
+                        self.members[candidate].append(key)
+                        self._representative[key] = candidate
+                        return candidate
+
+            # Only representatives are indexed, so clusters can't drift through chains of small edits
+            for band, band_key in enumerate(band_keys):
+                self._buckets[band].setdefault(band_key, []).append(key)
+            self.members[key] = [key]
+            self._representative[key] = key
+            return key
+
+    def signature(self, key):
+        """The signature a text was added with, e.g. to cache it."""
+        return self._signatures[key]
+
+    def drop(self, key):
+        """
+        Removes a representative that turned out unusable (e.g. it failed to parse).
+        The next member of its cluster becomes the representative of the rest.
+
+        Returns:
+            The new representative's key, or None if `key` was alone in its cluster.
+        """
+        for band, band_key in enumerate(self._band_keys(self._signatures.pop(key))):
+            self._buckets[band][band_key].remove(key)
+        del self._representative[key]
+        members = self.members.pop(key)[1:]
+        if not members:
+            return None
+        successor = members[0]
+        for band, band_key in enumerate(self._band_keys(self._signatures[successor])):
+            self._buckets[band].setdefault(band_key, []).append(successor)
+        self.members[successor] = members
+        for member in members:
+            self._representative[member] = successor
+        return successor
+
+    def representative(self, key):
+        return self._representative.get(key, key)
+
+    def duplicate_count(self):
+        """Number of texts that were linked to an earlier representative."""
+        return len(self._representative) - len(self.members)
@@ -1,4 +1,5 @@
 # utils/file_loader.py
+import os
 
 def load_jd_skills_with_weights(jd_path):
     """
@@ -55,3 +56,33 @@ def load_jd_skills_with_weights_from_text(jd_text):
     }
 
     return matched_skills
+
+
+def load_jd(jd_path):
+    """
+    Reads the job description text file.
+
+    Returns:
+        str: The JD text, or an empty string if the file does not exist.
+    """
+    if not os.path.exists(jd_path):
+        return ""
+    with open(jd_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def load_jds(jd_dir):
+    """
+    Reads every .txt job description in a folder.
+
+    Returns:
+        dict: {file name without extension: JD text}, sorted by file name.
+    """
+    if not os.path.isdir(jd_dir):
+        return {}
+    jds = {}
+    for filename in sorted(os.listdir(jd_dir)):
+        if filename.endswith('.txt'):
+            with open(os.path.join(jd_dir, filename), 'r', encoding='utf-8') as f:
+                jds[os.path.splitext(filename)[0]] = f.read()
+    return jds
@@ -0,0 +1,159 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from utils import instrumentation
+
+from parser.resume_parser import ResumeParser, clean_text, get_lean_nlp, HEADER_WINDOW
+from utils.model_registry import get_nlp
+from utils.pdf_reader import read_pdf
+
+
+def _read_in_worker(path, timed):
+    """Pool task: reads one PDF, also returning its timing when tracing is on."""
+    if not timed:
+        return read_pdf(path), None
+    start = time.perf_counter()
+    text = read_pdf(path)
+    return text, (start, time.perf_counter() - start, os.getpid())
+
+
+def _timed_iter(iterable, name):
+    """Records how long each item of `iterable` took to produce, when tracing is on."""
+    if not instrumentation.is_enabled():
+        yield from iterable
+        return
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        instrumentation.add_event(name, start, time.perf_counter() - start)
+        yield item
+
+
+def extract_texts(paths, workers=None):
+    """
+    Reads PDFs in a process pool and yields results as soon as each one finishes.
+
+    Args:
+        paths (list): PDF file paths.
+        workers (int): Number of reader processes. 1 reads sequentially in this process.
+
+    Yields:
+        tuple: (position, path, text, error) where `position` is the index in `paths`
+        and `error` is None on success.
+    """
+    if workers == 1:
+        for position, path in enumerate(paths):
+            text = read_pdf(path)
+            yield position, path, text, None if text else "no text could be extracted"
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        timed = instrumentation.is_enabled()
+        futures = {pool.submit(_read_in_worker, path, timed): (position, path) for position, path in enumerate(paths)}
+        for future in as_completed(futures):
+            position, path = futures[future]
+            try:
+                text, timing = future.result()
+            except Exception as e:
+                # A crashing PDF only costs us this one file
+                yield position, path, "", str(e)
+                continue
+            if timing is not None:
+                # Spans recorded inside the worker process are lost, so re-record it here
+                start, duration, pid = timing
+                instrumentation.add_event('read_pdf', start, duration, pid=pid, chars=len(text))
+            yield position, path, text, None if text else "no text could be extracted"
+
+
+def _pipe_inputs(texts, lean):
+    """
+    Feeds each resume into nlp.pipe: the cleaned text and its header window,
+    or only the header window in lean mode.
+    """
+    for position, path, text, error in texts:
+        cleaned = clean_text(text)
+        if not lean:
+            yield cleaned, (position, path, text, 'doc')
+        yield cleaned[:HEADER_WINDOW], (position, path, text, 'header')
+
+
+def ingest_resumes(paths, workers=None, batch_size=32, lean=True, regex_only=False):
+    """
+    Reads and parses resumes in parallel, yielding them in completion order.
+
+    PDF extraction runs in a process pool, and the spaCy work goes through
+    nlp.pipe with `batch_size` and `n_process=workers`. With workers=1 every
+    file is read and parsed sequentially, exactly like the original loop.
+    `lean` uses ResumeParser's lean mode (same output, NER on the header only).
+    `regex_only` skips spaCy altogether; PDFs are still read in parallel.
+
+    Yields:
+        tuple: (position, path, details, error). `details` is the output of
+        ResumeParser.get_details(), or None when the file failed.
+    """
+    workers = workers or os.cpu_count() or 1
+    yield from parse_texts(extract_texts(paths, workers), workers, batch_size, lean, regex_only)
+
+
+def parse_texts(texts, workers=None, batch_size=32, lean=True, regex_only=False):
+    """
+    The parsing half of ingest_resumes, for texts that were already extracted.
+
+    Args:
+        texts (iterable): (position, path, text, error) tuples, as extract_texts yields them.
+
+    Yields:
+        tuple: (position, path, details, error), as ingest_resumes does.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or regex_only:
+        for position, path, text, error in texts:
+            if error:
+                yield position, path, None, error
+                continue
+            try:
+                details = ResumeParser(text, lean=lean, regex_only=regex_only).get_details()
+            except Exception as e:
+                yield position, path, None, f"parsing failed: {e}"
+                continue
+            yield position, path, details, None
+        return
+
+    # Failed files are reported straight away and never reach the NLP stage
+    failed = []
+
+    def good_texts():
+        for item in texts:
+            if item[3]:
+                failed.append(item)
+            else:
+                yield item
+
+    nlp = get_lean_nlp() if lean else get_nlp()
+    docs = nlp.pipe(_pipe_inputs(good_texts(), lean), as_tuples=True, batch_size=batch_size, n_process=workers)
+    docs = _timed_iter(docs, 'nlp.pipe')
+    pending_doc = None
+    for doc, (position, path, text, kind) in docs:
+        while failed:
+            f_position, f_path, _, f_error = failed.pop(0)
+            yield f_position, f_path, None, f_error
+        if kind == 'doc':
+            pending_doc = doc
+            continue
+        # nlp.pipe keeps input order, so the header doc always follows its full doc
+        full_doc, pending_doc = pending_doc, None
+        try:
+            details = ResumeParser(text, nlp=nlp, doc=full_doc, header_doc=doc, lean=lean).get_details()
+        except Exception as e:
+            # Like a failed read, a resume the parser chokes on only costs us this one file
+            yield position, path, None, f"parsing failed: {e}"
+            continue
+        yield position, path, details, None
+
+    for f_position, f_path, _, f_error in failed:
+        yield f_position, f_path, None, f_error
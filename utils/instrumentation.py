@@ -0,0 +1,306 @@
+"""
+Lightweight per-stage timing for the scanning pipeline.
+
+Stages are wrapped in `span('name', **attrs)`. While instrumentation is
+disabled (the default) `span` hands back a shared no-op object, so the cost is
+one global check per call. Once enabled, every span records its start,
+duration, process/thread and attributes (e.g. bytes or token counts), which
+can be summarised per stage or written as a JSON or Chrome trace file
+(open the latter in chrome://tracing or https://ui.perfetto.dev).
+
+`profiled('name')` optionally runs a block under cProfile or a sampling
+profiler for finding the hot spots inside a stage.
+
+enable() records process-wide, which suits a CLI run. A server or app that runs
+several requests at once uses `with recording() as recorder:` instead: spans in
+that context (thread) go to its own recorder and nowhere else.
+"""
+import contextvars
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+_enabled = False
+_profile_mode = None
+_lock = threading.Lock()
+_events = []
+_profiles = {}
+_samples = defaultdict(Counter)
+# The Recorder of the current context, if any (see recording())
+_recorder = contextvars.ContextVar('instrumentation_recorder', default=None)
+
+
+def enable(profile=None):
+    """
+    Turns instrumentation on.
+
+    Args:
+        profile (str): Also profile `profiled()` blocks: 'cprofile', 'sample' or None.
+    """
+    global _enabled, _profile_mode
+    if profile not in (None, 'cprofile', 'sample'):
+        raise ValueError(f"Unknown profile mode: {profile}")
+    _enabled = True
+    _profile_mode = profile
+
+
+def disable():
+    global _enabled, _profile_mode
+    _enabled = False
+    _profile_mode = None
+
+
+def is_enabled():
+    """True while events are recorded, globally or into the current context's recorder."""
+    return _enabled or _recorder.get() is not None
+
+
+class Recorder:
+    """Events recorded by one run, kept apart from the global events and from other runs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = []
+
+    def add(self, event):
+        with self._lock:
+            self._events.append(event)
+
+    def events(self):
+        with self._lock:
+            return list(self._events)
+
+    def summary(self):
+        return _summarize(self.events())
+
+
+@contextmanager
+def recording():
+    """
+    Records the spans of a `with` block into a fresh Recorder, without touching the
+    global switch or events, so concurrent runs (e.g. Streamlit sessions) can't mix.
+    """
+    recorder = Recorder()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+
+
+def reset():
+    """Drops everything recorded so far."""
+    with _lock:
+        _events.clear()
+        _profiles.clear()
+        _samples.clear()
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('name', 'attrs', 'start')
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        add_event(self.name, self.start, time.perf_counter() - self.start, **self.attrs)
+        return False
+
+    def set(self, **attrs):
+        """Attaches sizes or counts that are only known once the stage has run."""
+        self.attrs.update(attrs)
+
+
+def span(name, **attrs):
+    """Times a `with` block as one event of stage `name`."""
+    if not _enabled and _recorder.get() is None:
+        return _NULL_SPAN
+    return _Span(name, attrs)
+
+
+def add_event(name, start, duration, pid=None, tid=None, **attrs):
+    """
+    Records an already-timed event, e.g. one measured inside a worker process.
+    `start` is a time.perf_counter() value.
+    """
+    recorder = _recorder.get()
+    if not _enabled and recorder is None:
+        return
+    event = {
+        'name': name,
+        'start': start,
+        'duration': duration,
+        'pid': pid or os.getpid(),
+        'tid': tid or threading.get_ident(),
+        'attrs': attrs,
+    }
+    if recorder is not None:
+        recorder.add(event)
+        return
+    with _lock:
+        _events.append(event)
+
+
+def events():
+    with _lock:
+        return list(_events)
+
+
+def summary():
+    """
+    Aggregates events per stage.
+
+    Returns:
+        dict: {stage: {'count', 'total_s', 'mean_ms', 'max_ms', <summed numeric attrs>}}, slowest stage first.
+    """
+    return _summarize(events())
+
+
+def _summarize(recorded):
+    stages = {}
+    for event in recorded:
+        stage = stages.setdefault(event['name'], {'count': 0, 'total_s': 0.0, 'max_ms': 0.0})
+        stage['count'] += 1
+        stage['total_s'] += event['duration']
+        stage['max_ms'] = max(stage['max_ms'], event['duration'] * 1000)
+        for key, value in event['attrs'].items():
+            if key in stage and key in ('count', 'total_s', 'max_ms'):
+                continue
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                stage[key] = stage.get(key, 0) + value
+    for stage in stages.values():
+        stage['mean_ms'] = stage['total_s'] * 1000 / stage['count']
+    return dict(sorted(stages.items(), key=lambda item: item[1]['total_s'], reverse=True))
+
+
+def write_json(path):
+    """Writes the per-stage summary and the raw events as JSON."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'summary': summary(), 'events': events()}, f, indent=2, default=str)
+
+
+def write_chrome_trace(path):
+    """Writes the events in Chrome's Trace Event format (complete 'X' events, microseconds)."""
+    recorded = events()
+    origin = min((event['start'] for event in recorded), default=0.0)
+    trace_events = [
+        {
+            'name': event['name'],
+            'ph': 'X',
+            'ts': (event['start'] - origin) * 1e6,
+            'dur': event['duration'] * 1e6,
+            'pid': event['pid'],
+            'tid': event['tid'],
+            'args': event['attrs'],
+        }
+        for event in recorded
+    ]
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f, default=str)
+
+
+# --- Opt-in profiling of hot loops ---
+
+class _SamplingProfiler(threading.Thread):
+    """Samples the profiled thread's stack every `interval` seconds."""
+
+    def __init__(self, name, thread_id, interval=0.005):
+        super().__init__(daemon=True)
+        self.profile_name = name
+        self.thread_id = thread_id
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                code = frame.f_code
+                key = f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+                with _lock:
+                    _samples[self.profile_name][key] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class _Profiled:
+    def __init__(self, name):
+        self.name = name
+        self._profiler = None
+
+    def __enter__(self):
+        if _profile_mode == 'cprofile':
+            with _lock:
+                self._profiler = _profiles.setdefault(self.name, cProfile.Profile())
+            self._profiler.enable()
+        elif _profile_mode == 'sample':
+            self._profiler = _SamplingProfiler(self.name, threading.get_ident())
+            self._profiler.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if _profile_mode == 'cprofile':
+            self._profiler.disable()
+        elif _profile_mode == 'sample':
+            self._profiler.stop()
+        return False
+
+
+def profiled(name):
+    """Profiles a `with` block when profiling was enabled; otherwise does nothing."""
+    if not _enabled or _profile_mode is None:
+        return _NULL_SPAN
+    return _Profiled(name)
+
+
+def profile_report(top=25):
+    """Returns a text report of every profiled block."""
+    out = io.StringIO()
+    for name, profiler in _profiles.items():
+        out.write(f"=== {name} (cProfile, by cumulative time)\n")
+        pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(top)
+    for name, counts in _samples.items():
+        total = sum(counts.values())
+        out.write(f"=== {name} ({total} samples)\n")
+        for location, count in counts.most_common(top):
+            out.write(f"{count / total * 100:6.1f}%  {location}\n")
+    return out.getvalue()
+
+
+def write_profiles(directory):
+    """Writes one .prof file per cProfile'd block (for snakeviz etc.) plus a text report."""
+    os.makedirs(directory, exist_ok=True)
+    for name, profiler in _profiles.items():
+        profiler.dump_stats(os.path.join(directory, f"{name}.prof"))
+    with open(os.path.join(directory, 'profile_report.txt'), 'w', encoding='utf-8') as f:
+        f.write(profile_report())
@@ -0,0 +1,149 @@
+"""
+Manifest of an ingested resume folder, for incremental runs of main.py.
+
+For every PDF it records the size, mtime and content hash together with the
+parsed candidate record and its embedding, in one SQLite file. A scan only
+stats the folder: files whose size and mtime are unchanged are taken from the
+manifest without being opened, and only new or modified files are hashed.
+Records written by another parser version or embedding model count as changed.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+from collections import namedtuple
+
+import numpy as np
+
+from parser.resume_parser import PARSER_VERSION
+from utils.model_registry import SENTENCE_MODEL
+
+DEFAULT_MANIFEST_PATH = os.path.join('.cache', 'manifest.sqlite3')
+
+# Lists of file names; `hashes` and `stats` map each new/changed file to its content hash
+# and to the (size, mtime_ns) seen when it was hashed
+ManifestChanges = namedtuple('ManifestChanges', ['unchanged', 'new', 'changed', 'deleted', 'hashes', 'stats'])
+
+
+def _content_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ResumeManifest:
+    def __init__(self, path=DEFAULT_MANIFEST_PATH, model_name=SENTENCE_MODEL):
+        self.path = path
+        self.version = f"{PARSER_VERSION}:{model_name}"
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        # One row per file; `root` is the absolute folder so one manifest can track several folders
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " root TEXT NOT NULL, filename TEXT NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,"
+            " content_hash TEXT NOT NULL, version TEXT NOT NULL, details TEXT, embedding BLOB,"
+            " PRIMARY KEY (root, filename))"
+        )
+        self._conn.commit()
+
+    def scan(self, resumes_dir):
+        """
+        Compares the folder with the manifest.
+
+        Returns:
+            ManifestChanges: unchanged, new, changed and deleted file names, plus the
+            content hash and stat of every new or changed file.
+        """
+        root = os.path.abspath(resumes_dir)
+        listed = {
+            entry.name: entry.stat()
+            for entry in os.scandir(resumes_dir) if entry.name.endswith('.pdf') and entry.is_file()
+        }
+        stored = {
+            row[0]: row[1:]
+            for row in self._conn.execute(
+                "SELECT filename, size, mtime_ns, content_hash, version FROM files WHERE root = ?", (root,)
+            )
+        }
+
+        unchanged, new, changed, touched = [], [], [], []
+        hashes = {}
+        stats = {}
+        for filename in sorted(listed):
+            stat = listed[filename]
+            previous = stored.get(filename)
+            if previous is not None and previous[3] == self.version and previous[:2] == (stat.st_size, stat.st_mtime_ns):
+                unchanged.append(filename)
+                continue
+            content_hash = _content_hash(os.path.join(resumes_dir, filename))
+            if previous is not None and previous[3] == self.version and previous[2] == content_hash:
+                # Touched or copied over with identical bytes: only the stat is out of date
+                unchanged.append(filename)
+                touched.append((stat.st_size, stat.st_mtime_ns, root, filename))
+                continue
+            hashes[filename] = content_hash
+            stats[filename] = (stat.st_size, stat.st_mtime_ns)
+            (changed if previous is not None else new).append(filename)
+
+        if touched:
+            self._conn.executemany("UPDATE files SET size = ?, mtime_ns = ? WHERE root = ? AND filename = ?", touched)
+            self._conn.commit()
+        deleted = sorted(set(stored) - set(listed))
+        return ManifestChanges(unchanged, new, changed, deleted, hashes, stats)
+
+    def update(self, resumes_dir, entries, stats):
+        """
+        Stores freshly processed files.
+
+        The stat recorded is the one scan() took before hashing, not a fresh one: a file
+        rewritten during the run then no longer matches it and is processed again next time.
+        Files deleted during the run are skipped.
+
+        Args:
+            entries (iterable): (filename, content_hash, details, embedding). `details` is None
+                for unreadable files, so they are not retried until they change.
+            stats (dict): {filename: (size, mtime_ns)}, i.e. ManifestChanges.stats.
+        """
+        root = os.path.abspath(resumes_dir)
+        rows = []
+        for filename, content_hash, details, embedding in entries:
+            if not os.path.exists(os.path.join(resumes_dir, filename)):
+                continue
+            size, mtime_ns = stats[filename]
+            rows.append((
+                root, filename, size, mtime_ns, content_hash, self.version,
+                json.dumps(details) if details is not None else None,
+                np.asarray(embedding, dtype=np.float32).tobytes() if embedding is not None else None,
+            ))
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO files (root, filename, size, mtime_ns, content_hash, version, details, embedding)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        self._conn.commit()
+
+    def remove(self, resumes_dir, filenames):
+        """Drops deleted files from the manifest."""
+        root = os.path.abspath(resumes_dir)
+        self._conn.executemany("DELETE FROM files WHERE root = ? AND filename = ?",
+                               [(root, filename) for filename in filenames])
+        self._conn.commit()
+
+    def records(self, resumes_dir):
+        """Yields (filename, details, embedding) for every readable file in the folder, by file name."""
+        cursor = self._conn.execute(
+            "SELECT filename, details, embedding FROM files"
+            " WHERE root = ? AND details IS NOT NULL ORDER BY filename",
+            (os.path.abspath(resumes_dir),)
+        )
+        for filename, details, embedding in cursor:
+            yield (
+                filename,
+                json.loads(details),
+                np.frombuffer(embedding, dtype=np.float32) if embedding is not None else None,
+            )
+
+    def close(self):
+        self._conn.close()
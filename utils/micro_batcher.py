@@ -0,0 +1,140 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Collects encode calls from concurrent callers into micro-batches.
+
+    One background thread owns the encoder. A batch runs as soon as
+    `max_batch_size` texts are waiting, or `max_wait_ms` after the first of them
+    arrived, whichever comes first. Each caller gets back the rows for its own texts.
+    """
+
+    def __init__(self, encode, max_batch_size=64, max_wait_ms=10):
+        """
+        Args:
+            encode (callable): Takes a list of texts, returns a (n, dim) array.
+            max_batch_size (int): Texts per encoder call (a larger single request still runs whole).
+            max_wait_ms (float): How long the first waiting text may be held back to fill a batch.
+        """
+        self.encode_batch = encode
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats = {'batches': 0, 'texts': 0, 'largest_batch': 0, 'encode_s': 0.0}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, texts):
+        """
+        Queues texts for encoding and returns a Future of their (len(texts), dim) array.
+
+        Raises:
+            RuntimeError: The batcher has been closed.
+        """
+        future = Future()
+        if not texts:
+            future.set_result(np.zeros((0, 0), dtype=np.float32))
+            return future
+        # Checked under the lock close() takes, so nothing is queued behind the stop marker
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._queue.put((list(texts), future))
+        return future
+
+    def encode(self, texts):
+        """Blocking version of `submit`."""
+        return self.submit(texts).result()
+
+    def _run(self):
+        try:
+            self._loop()
+        finally:
+            # Anything still queued would otherwise wait forever
+            self._fail_pending(RuntimeError("MicroBatcher is closed"))
+
+    def _loop(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            pending = [item]
+            size = len(item[0])
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    # Finish what was already collected, then exit
+                    stopping = True
+                    break
+                pending.append(item)
+                size += len(item[0])
+            self._run_batch(pending)
+
+    def _fail_pending(self, error):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP:
+                item[1].set_exception(error)
+
+    def _run_batch(self, pending):
+        texts = [text for item_texts, _ in pending for text in item_texts]
+        start = time.perf_counter()
+        try:
+            embeddings = np.asarray(self.encode_batch(texts), dtype=np.float32)
+        except Exception as e:
+            for _, future in pending:
+                future.set_exception(e)
+            return
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['texts'] += len(texts)
+            self._stats['largest_batch'] = max(self._stats['largest_batch'], len(texts))
+            self._stats['encode_s'] += time.perf_counter() - start
+
+        offset = 0
+        for item_texts, future in pending:
+            future.set_result(embeddings[offset:offset + len(item_texts)])
+            offset += len(item_texts)
+
+    def stats(self):
+        """Returns batch counts and sizes so far, plus the current queue depth."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['mean_batch_size'] = round(stats['texts'] / stats['batches'], 2) if stats['batches'] else 0.0
+        stats['queue_depth'] = self._queue.qsize()
+        stats['max_batch_size'] = self.max_batch_size
+        stats['max_wait_ms'] = self.max_wait * 1000
+        return stats
+
+    def close(self):
+        """
+        Stops the batching thread once everything already queued has been encoded.
+        Later `submit` calls raise RuntimeError.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
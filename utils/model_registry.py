@@ -0,0 +1,94 @@
+import threading
+from utils.instrumentation import span
+
+# --- Default models used across the project ---
+SPACY_MODEL = 'en_core_web_sm'
+SENTENCE_MODEL = 'all-MiniLM-L6-v2'
+
+_lock = threading.Lock()
+_spacy_models = {}
+_sentence_models = {}
+_default_spacy_disable = ()
+
+
+def configure(spacy_disable=None):
+    """
+    Sets which spaCy pipes are left out when a pipeline is loaded without an
+    explicit `disable` list (e.g. ['parser', 'lemmatizer']).
+    """
+    global _default_spacy_disable
+    _default_spacy_disable = tuple(sorted(spacy_disable or ()))
+
+
+def get_nlp(model_name=SPACY_MODEL, disable=None, enable=None):
+    """
+    Returns a shared spaCy pipeline, loading it the first time it is requested.
+
+    Args:
+        model_name (str): The spaCy package to load.
+        disable (list): Pipes to leave out. Each distinct set is cached separately.
+        enable (list): Only load these pipes (everything else is disabled). Overrides `disable`.
+
+    Returns:
+        spacy.language.Language: The loaded pipeline.
+    """
+    if enable is not None:
+        key = (model_name, 'enable', tuple(sorted(enable)))
+    else:
+        key = (model_name, 'disable', _default_spacy_disable if disable is None else tuple(sorted(disable)))
+    nlp = _spacy_models.get(key)
+    if nlp is None:
+        with _lock:
+            nlp = _spacy_models.get(key)
+            if nlp is None:
+                with span('load_model', model=model_name):
+                    import spacy
+                    if enable is not None:
+                        nlp = spacy.load(model_name, enable=list(key[2]))
+                    else:
+                        nlp = spacy.load(model_name, disable=list(key[2]))
+                _spacy_models[key] = nlp
+    return nlp
+
+
+def get_sentence_model(model_name=SENTENCE_MODEL):
+    """Returns a shared SentenceTransformer, loading it the first time it is requested."""
+    model = _sentence_models.get(model_name)
+    if model is None:
+        with _lock:
+            model = _sentence_models.get(model_name)
+            if model is None:
+                with span('load_model', model=model_name):
+                    from sentence_transformers import SentenceTransformer
+                    model = SentenceTransformer(model_name)
+                _sentence_models[model_name] = model
+    return model
+
+
+def warm_up(spacy_disable=None, load_sentence_model=True, load_spacy=True):
+    """
+    Loads the default models up front so the first resume doesn't pay for it.
+
+    Args:
+        spacy_disable (list): Pipes to leave out; also becomes the default for get_nlp().
+        load_sentence_model (bool): Whether to load the SentenceTransformer.
+        load_spacy (bool): Whether to load the spaCy pipeline.
+
+    Returns:
+        dict: The loaded models, keyed by 'nlp' and 'sentence_model'.
+    """
+    if spacy_disable is not None:
+        configure(spacy_disable)
+    models = {}
+    if load_spacy:
+        models['nlp'] = get_nlp()
+    if load_sentence_model:
+        models['sentence_model'] = get_sentence_model()
+    return models
+
+
+def clear():
+    """Drops every cached model (mainly useful for freeing memory)."""
+    with _lock:
+        _spacy_models.clear()
+        _sentence_models.clear()
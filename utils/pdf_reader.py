@@ -1,27 +1,70 @@
 import fitz  # PyMuPDF
+import io
 import os
+from utils.instrumentation import span
 
-def read_pdf(file_path):
+
+def _open_document(source):
+    """Opens a PDF from a path, or straight from memory without touching disk."""
+    if isinstance(source, (str, os.PathLike)):
+        return fitz.open(source)
+    if isinstance(source, memoryview):
+        source = source.tobytes()
+    elif hasattr(source, 'read'):
+        if isinstance(source, io.BytesIO):
+            source = source.getbuffer().tobytes()
+        else:
+            source = source.read()
+    return fitz.open(stream=source, filetype='pdf')
+
+
+def _source_name(source):
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.basename(source)
+    return getattr(source, 'name', '<in-memory PDF>')
+
+
+def iter_pdf_pages(source, max_pages=None):
+    """
+    Yields the text of a PDF one page at a time.
+
+    Args:
+        source: A file path, bytes/bytearray/memoryview, or a binary file-like object.
+        max_pages (int): Stop after this many pages. None reads every page.
+
+    Yields:
+        str: The text of each page.
+    """
+    with _open_document(source) as doc:
+        for page_number, page in enumerate(doc):
+            if max_pages is not None and page_number >= max_pages:
+                break
+            yield page.get_text()
+
+
+def read_pdf(source, max_pages=None):
     """
     Reads text from a PDF file.
 
     Args:
-        file_path (str): The path to the PDF file.
+        source: The path to the PDF file, its bytes (bytes, bytearray or
+            memoryview), or a binary file-like object such as an upload.
+        max_pages (int): Only read the first `max_pages` pages.
 
     Returns:
         str: The extracted text from the PDF, or an empty string if an error occurs.
     """
-    if not os.path.exists(file_path):
-        print(f"Error: File not found at {file_path}")
+    if isinstance(source, (str, os.PathLike)) and not os.path.exists(source):
+        print(f"Error: File not found at {source}")
         return ""
         
     try:
-        doc = fitz.open(file_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        doc.close()
+        with span('read_pdf') as stage:
+            pages = list(iter_pdf_pages(source, max_pages))
+            # Join once at the end instead of growing one string page by page
+            text = "".join(pages)
+            stage.set(pages=len(pages), chars=len(text))
         return text
     except Exception as e:
-        print(f"Error reading PDF file {os.path.basename(file_path)}: {e}")
-        return ""
\ No newline at end of file
+        print(f"Error reading PDF file {_source_name(source)}: {e}")
+        return ""
@@ -0,0 +1,40 @@
+import csv
+import json
+import os
+
+
+class ResultWriter:
+    """
+    Appends scored candidate rows to a CSV or JSONL file as they are produced,
+    so nothing has to be held in memory until the end of the run.
+    The format follows the file extension (.jsonl / .json -> JSON lines, anything else -> CSV).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.is_jsonl = os.path.splitext(path)[1].lower() in ('.jsonl', '.json')
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._csv_writer = None
+        self.rows_written = 0
+
+    def write(self, row):
+        if self.is_jsonl:
+            # Rows may be CandidateRecords, which json only serialises as plain dicts
+            self._file.write(json.dumps(dict(row), default=str) + '\n')
+        else:
+            if self._csv_writer is None:
+                # Columns come from the first row, like pandas would use
+                self._csv_writer = csv.DictWriter(self._file, fieldnames=list(row.keys()), extrasaction='ignore')
+                self._csv_writer.writeheader()
+            self._csv_writer.writerow(row)
+        self.rows_written += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
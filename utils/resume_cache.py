@@ -0,0 +1,243 @@
+"""
+On-disk cache of parsed resumes and their embeddings.
+
+Entries are keyed by the SHA-256 of the PDF bytes together with the parser
+version and the embedding model name, so a changed PDF, parser or model never
+returns stale results. The cache has a size limit and evicts the least
+recently used entries first.
+
+Inspect or prune it from the terminal:
+    python -m utils.resume_cache stats
+    python -m utils.resume_cache prune --max-size-mb 200
+    python -m utils.resume_cache clear
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from parser.resume_parser import PARSER_VERSION
+from utils.model_registry import SENTENCE_MODEL
+
+DEFAULT_CACHE_PATH = os.path.join('.cache', 'resume_cache.sqlite3')
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+# Least recently used entries fetched per round when evicting
+_EVICT_BATCH = 256
+# Keys per SELECT ... IN (...); older SQLite builds allow at most 999 parameters
+_LOOKUP_BATCH = 500
+
+
+class ResumeCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES, model_name=SENTENCE_MODEL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.model_name = model_name
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # Streamlit reruns on different threads, so share one guarded connection
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, details TEXT, embedding BLOB,"
+            " size INTEGER NOT NULL, last_access REAL NOT NULL, signature BLOB)"
+        )
+        # Caches created before near-duplicate signatures were stored lack the column
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        if 'signature' not in columns:
+            self._conn.execute("ALTER TABLE entries ADD COLUMN signature BLOB")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON entries (last_access)")
+        # Running total of entries.size, kept by triggers in the same transaction as every
+        # write, so enforcing the size limit never has to sum the whole table
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._conn.executescript(
+            "CREATE TRIGGER IF NOT EXISTS entries_size_insert AFTER INSERT ON entries BEGIN"
+            " UPDATE meta SET value = value + NEW.size WHERE name = 'total_size'; END;"
+            "CREATE TRIGGER IF NOT EXISTS entries_size_delete AFTER DELETE ON entries BEGIN"
+            " UPDATE meta SET value = value - OLD.size WHERE name = 'total_size'; END;"
+            "CREATE TRIGGER IF NOT EXISTS entries_size_update AFTER UPDATE OF size ON entries BEGIN"
+            " UPDATE meta SET value = value + NEW.size - OLD.size WHERE name = 'total_size'; END;"
+        )
+        # One full scan, only for caches created before the total was kept
+        self._conn.execute(
+            "INSERT OR IGNORE INTO meta (name, value) SELECT 'total_size', COALESCE(SUM(size), 0) FROM entries"
+        )
+        self._conn.commit()
+
+    def key_for(self, pdf_bytes):
+        """Builds the cache key for a PDF from its bytes, the parser version and the model."""
+        digest = hashlib.sha256(pdf_bytes).hexdigest()
+        return f"{digest}:{PARSER_VERSION}:{self.model_name}"
+
+    def _lookup(self, columns, keys):
+        """
+        Fetches `columns` for every key that has a row, and marks all of them as
+        used in one transaction rather than one commit per key.
+
+        Returns:
+            dict: {key: row tuple of `columns`}.
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _LOOKUP_BATCH):
+                batch = keys[start:start + _LOOKUP_BATCH]
+                rows = self._conn.execute(
+                    f"SELECT key, {columns} FROM entries WHERE key IN ({', '.join('?' * len(batch))})", batch
+                ).fetchall()
+                found.update((row[0], row[1:]) for row in rows)
+            if found:
+                now = time.time()
+                self._conn.executemany("UPDATE entries SET last_access = ? WHERE key = ?",
+                                       [(now, key) for key in found])
+                self._conn.commit()
+        return found
+
+    def get(self, key):
+        """
+        Looks up a cached resume.
+
+        Returns:
+            tuple: (details, embedding), where either may be None, or None on a miss.
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        """
+        Looks up many cached resumes at once.
+
+        Returns:
+            dict: {key: (details, embedding)} for the keys found; either value may be None.
+        """
+        return {
+            key: (json.loads(details) if details is not None else None,
+                  np.frombuffer(embedding, dtype=np.float32) if embedding is not None else None)
+            for key, (details, embedding) in self._lookup('details, embedding', keys).items()
+        }
+
+    def put(self, key, details=None, embedding=None):
+        """Stores the get_details() output and/or the resume embedding, then enforces the size limit."""
+        self.put_many([(key, details, embedding)])
+
+    def put_many(self, entries):
+        """Stores many (key, details, embedding) entries in a single transaction."""
+        rows = []
+        now = time.time()
+        for key, details, embedding in entries:
+            details_json = json.dumps(details) if details is not None else None
+            embedding_blob = np.asarray(embedding, dtype=np.float32).tobytes() if embedding is not None else None
+            size = len(key) + len(details_json or '') + len(embedding_blob or b'')
+            rows.append((key, details_json, embedding_blob, size, now))
+        with self._lock:
+            # An upsert rather than INSERT OR REPLACE, whose implicit delete wouldn't fire the size trigger
+            self._conn.executemany(
+                "INSERT INTO entries (key, details, embedding, size, last_access) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET details = excluded.details, embedding = excluded.embedding,"
+                " size = excluded.size, last_access = excluded.last_access, signature = NULL",
+                rows
+            )
+            self._conn.commit()
+        self.prune()
+
+    def get_signatures(self, keys):
+        """
+        Looks up the near-duplicate signatures stored for resumes that were never parsed.
+
+        Returns:
+            dict: {key: uint64 MinHash signature} for the keys that have one.
+        """
+        return {
+            key: np.frombuffer(signature, dtype=np.uint64)
+            for key, (signature,) in self._lookup('signature', keys).items() if signature is not None
+        }
+
+    def put_signatures(self, entries):
+        """
+        Stores (key, signature) pairs for near-duplicates, which are never parsed
+        or embedded. Keys that already have an entry are left as they are.
+        """
+        now = time.time()
+        rows = []
+        for key, signature in entries:
+            signature_blob = np.asarray(signature, dtype=np.uint64).tobytes()
+            rows.append((key, signature_blob, len(key) + len(signature_blob), now))
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO entries (key, signature, size, last_access) VALUES (?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+        self.prune()
+
+    def stats(self):
+        """Returns the number of entries and their total size in bytes."""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            total = self._total_size()
+        return {'path': self.path, 'entries': count, 'bytes': total, 'max_bytes': self.max_bytes}
+
+    def _total_size(self):
+        return self._conn.execute("SELECT value FROM meta WHERE name = 'total_size'").fetchone()[0]
+
+    def prune(self, max_bytes=None):
+        """Evicts least recently used entries until the cache fits in `max_bytes`. Returns how many were removed."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        removed = 0
+        with self._lock:
+            total = self._total_size()
+            while total > limit:
+                rows = self._conn.execute(
+                    "SELECT key, size FROM entries ORDER BY last_access LIMIT ?", (_EVICT_BATCH,)
+                ).fetchall()
+                if not rows:
+                    break
+                evicted = []
+                for key, size in rows:
+                    if total <= limit:
+                        break
+                    evicted.append((key,))
+                    total -= size
+                self._conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+                removed += len(evicted)
+            self._conn.commit()
+        return removed
+
+    def clear(self):
+        """Removes every entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+
+    def close(self):
+        self._conn.close()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Inspect or prune the resume cache.")
+    arg_parser.add_argument('command', choices=['stats', 'prune', 'clear'])
+    arg_parser.add_argument('--path', default=DEFAULT_CACHE_PATH, help="Cache database file.")
+    arg_parser.add_argument('--max-size-mb', type=float, default=None, help="Size to prune down to.")
+    args = arg_parser.parse_args()
+
+    cache = ResumeCache(args.path)
+    if args.command == 'prune':
+        max_bytes = int(args.max_size_mb * 1024 * 1024) if args.max_size_mb is not None else None
+        print(f"Evicted {cache.prune(max_bytes)} entries.")
+    elif args.command == 'clear':
+        cache.clear()
+        print("Cache cleared.")
+
+    stats = cache.stats()
+    print(f"{stats['path']}: {stats['entries']} entries, {stats['bytes'] / (1024 * 1024):.1f} MB "
+          f"(limit {stats['max_bytes'] / (1024 * 1024):.0f} MB)")
+    cache.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+"""
+File-based protocol for sharded ranking runs of main.py.
+
+The coordinator splits the resume list into contiguous shards and writes one
+job file per shard into a shared folder. Workers claim a job by renaming it,
+rank their slice and write back only their local top-k rows. The workers can
+be local processes, or `python main.py --shard-worker <folder>` on any machine
+that sees the same folder (and the resume paths in the jobs). The coordinator
+then merges the shard results into the global ranking.
+
+Every row carries its position in the coordinator's resume list, so ties are
+broken exactly as in an unsharded run.
+
+A worker touches its claim file every HEARTBEAT_S seconds while it runs a
+job. If the coordinator sees a claim go untouched for CLAIM_STALE_S seconds,
+it assumes the worker died and puts the job back for another worker. Staleness
+is measured on the coordinator's own clock, so clock skew between machines
+doesn't matter.
+"""
+import heapq
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+JOB_SUFFIX = '.job.json'
+RUNNING_SUFFIX = '.running.json'
+RESULT_SUFFIX = '.result.json'
+
+HEARTBEAT_S = 10
+CLAIM_STALE_S = 60
+# With a shared folder the coordinator can't see whether any worker is left, so it never waits forever
+SHARED_DIR_TIMEOUT_S = 3600
+
+
+def split_shards(items, shards):
+    """
+    Splits a list into at most `shards` contiguous, near-equal slices.
+
+    Returns:
+        list: (offset, slice) pairs; empty slices are left out.
+    """
+    size, extra = divmod(len(items), shards)
+    slices = []
+    offset = 0
+    for shard in range(shards):
+        length = size + (1 if shard < extra else 0)
+        if length:
+            slices.append((offset, items[offset:offset + length]))
+        offset += length
+    return slices
+
+
+def _write_json_atomic(path, data):
+    # Readers polling the folder must never see a half-written file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def write_jobs(shard_dir, run_id, jobs):
+    """Writes one job file per shard and returns the shard names to wait for."""
+    os.makedirs(shard_dir, exist_ok=True)
+    names = []
+    for shard, job in enumerate(jobs):
+        name = f"{run_id}_shard_{shard:04d}"
+        _write_json_atomic(os.path.join(shard_dir, name + JOB_SUFFIX), job)
+        names.append(name)
+    return names
+
+
+def claim_next_job(shard_dir):
+    """
+    Claims the first unclaimed job in the folder.
+
+    Returns:
+        tuple: (name, job), or None when there is nothing left to claim.
+    """
+    for filename in sorted(os.listdir(shard_dir)):
+        if not filename.endswith(JOB_SUFFIX):
+            continue
+        name = filename[:-len(JOB_SUFFIX)]
+        running_path = os.path.join(shard_dir, name + RUNNING_SUFFIX)
+        try:
+            # The rename is atomic, so exactly one worker wins each job
+            os.rename(os.path.join(shard_dir, filename), running_path)
+        except FileNotFoundError:
+            continue
+        with open(running_path, encoding='utf-8') as f:
+            return name, json.load(f)
+    return None
+
+
+@contextmanager
+def keep_claim(shard_dir, name, interval=HEARTBEAT_S):
+    """Touches a claimed job's file every `interval` seconds for as long as the block runs."""
+    running_path = os.path.join(shard_dir, name + RUNNING_SUFFIX)
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(interval):
+            try:
+                os.utime(running_path)
+            except FileNotFoundError:
+                # The coordinator re-queued the job; whoever finishes first publishes the result
+                return
+
+    thread = threading.Thread(target=beat, name=f"heartbeat-{name}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def write_result(shard_dir, name, result):
+    """Publishes a shard's result (or {'error': ...}) and releases its claim."""
+    _write_json_atomic(os.path.join(shard_dir, name + RESULT_SUFFIX), result)
+    try:
+        os.remove(os.path.join(shard_dir, name + RUNNING_SUFFIX))
+    except FileNotFoundError:
+        pass
+
+
+def _requeue_stale_claims(shard_dir, names, claims, stale_after):
+    """
+    Renames claims whose file hasn't changed for `stale_after` seconds back to jobs.
+    `claims` maps each name to (mtime seen, when it was first seen) between calls.
+    """
+    now = time.monotonic()
+    for name in names:
+        running_path = os.path.join(shard_dir, name + RUNNING_SUFFIX)
+        try:
+            mtime = os.stat(running_path).st_mtime_ns
+        except FileNotFoundError:
+            claims.pop(name, None)
+            continue
+        if name not in claims or claims[name][0] != mtime:
+            claims[name] = (mtime, now)
+        elif now - claims[name][1] > stale_after:
+            try:
+                os.rename(running_path, os.path.join(shard_dir, name + JOB_SUFFIX))
+            except FileNotFoundError:
+                continue
+            del claims[name]
+            print(f"Shard {name}: no heartbeat for {stale_after:.0f} s, re-queued for another worker.")
+
+
+def wait_for_results(shard_dir, names, timeout=None, poll_s=0.2, workers_alive=None, stale_after=CLAIM_STALE_S):
+    """
+    Polls the folder until every shard has a result.
+
+    Args:
+        timeout (float): Seconds to wait in total; None waits indefinitely.
+        workers_alive (callable): Returns False once no worker that could still
+            finish a shard is running, so a lost shard fails fast instead of hanging.
+        stale_after (float): Seconds without a heartbeat after which a claimed
+            shard is put back for another worker; None never re-queues.
+
+    Returns:
+        dict: {name: result}.
+
+    Raises:
+        RuntimeError: A worker reported an error, or every worker stopped early.
+        TimeoutError: Results were still missing after `timeout` seconds.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    results = {}
+    claims = {}
+    while True:
+        for name in names:
+            path = os.path.join(shard_dir, name + RESULT_SUFFIX)
+            if name in results or not os.path.exists(path):
+                continue
+            with open(path, encoding='utf-8') as f:
+                results[name] = json.load(f)
+            if 'error' in results[name]:
+                raise RuntimeError(f"Shard {name} failed: {results[name]['error']}")
+        if len(results) == len(names):
+            return results
+        if workers_alive is not None and not workers_alive():
+            # One last look: a worker may have finished right before exiting
+            if all(os.path.exists(os.path.join(shard_dir, name + RESULT_SUFFIX)) for name in names):
+                continue
+            missing = [name for name in names if name not in results]
+            raise RuntimeError(f"Every shard worker exited but {len(missing)} shard(s) have no result: {missing}")
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError(f"{len(names) - len(results)} shard(s) still running after {timeout} s")
+        if stale_after is not None:
+            _requeue_stale_claims(shard_dir, [name for name in names if name not in results], claims, stale_after)
+        time.sleep(poll_s)
+
+
+def remove_files(shard_dir, names):
+    """Deletes a run's job, claim and result files."""
+    for name in names:
+        for suffix in (JOB_SUFFIX, RUNNING_SUFFIX, RESULT_SUFFIX):
+            try:
+                os.remove(os.path.join(shard_dir, name + suffix))
+            except FileNotFoundError:
+                pass
+
+
+def merge_top_k(shard_rows, top_k=None):
+    """
+    Merges per-shard rankings into the global one.
+
+    Args:
+        shard_rows (iterable): One list per shard of [position, row] pairs, best first.
+        top_k (int): How many rows to keep; None keeps all of them.
+
+    Returns:
+        list: Rows ordered by final score, ties by position, exactly as one sorted pool would be.
+    """
+    merged = heapq.merge(*shard_rows, key=lambda entry: (-entry[1]['final_score'], entry[0]))
+    return [row for _, row in islice(merged, top_k)]
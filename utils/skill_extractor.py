@@ -1,6 +1,6 @@
-import spacy
 from collections import Counter
-import re
+from utils.skill_index import get_skill_index
+from utils.instrumentation import span
 
 # --- A COMPREHENSIVE & NOW CUSTOMIZED SKILL DATABASE ---
 SKILL_DB = [
@@ -26,20 +26,37 @@ SKILL_DB = [
     'g-suite', 'documentation', 'pitch decks'
 ]
 
+# --- Alternative spellings that should count as a SKILL_DB entry (alias -> skill) ---
+SKILL_ALIASES = {
+    'k8s': 'kubernetes',
+    'golang': 'go',
+    'js': 'javascript',
+    'nodejs': 'node.js',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'vue.js': 'vue',
+    'vuejs': 'vue',
+    'postgres': 'postgresql',
+    'mongo': 'mongodb',
+    'sklearn': 'scikit-learn',
+    'amazon web services': 'aws',
+    'google cloud platform': 'google cloud',
+    'ror': 'ruby on rails',
+    'gsuite': 'g-suite',
+}
+
+
+def get_default_skill_index():
+    """Returns the shared, compiled index over SKILL_DB and SKILL_ALIASES."""
+    return get_skill_index(SKILL_DB, SKILL_ALIASES)
+
 def extract_skills_from_jd(jd_text):
     """
     Extracts skills from the job description using a comprehensive skill list.
     """
-    nlp = spacy.load('en_core_web_sm')
-    doc = nlp(jd_text.lower())
-    
-    found_skills = []
-    
-    # Use regex to find whole-word matches for skills from the SKILL_DB
-    for skill in SKILL_DB:
-        # The \b ensures we match 'java' but not 'javascript' if we only want 'java'
-        if re.search(r'\b' + re.escape(skill) + r'\b', jd_text.lower()):
-            found_skills.append(skill)
+    # One scan of the JD finds every whole-word SKILL_DB entry (or alias)
+    with span('extract_skills_from_jd', chars=len(jd_text)):
+        found_skills = get_default_skill_index().find(jd_text)
             
     # If no skills are found, return empty values to prevent errors
     if not found_skills:
@@ -0,0 +1,118 @@
+import re
+from collections import Counter
+from functools import lru_cache
+
+_WORD_CHAR = re.compile(r'\w')
+
+
+def _is_word_char(char):
+    return bool(_WORD_CHAR.match(char))
+
+
+def _trie_pattern(node):
+    """Turns a character trie into a regex where shared prefixes are only tested once."""
+    alternatives = [
+        re.escape(char) + _trie_pattern(child)
+        for char, child in sorted(node.items()) if char != ''
+    ]
+    # Terminal branch goes last so the longest term at a position wins
+    if '' in node:
+        alternatives.append(r'\b')
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return '(?:' + '|'.join(alternatives) + ')'
+
+
+class SkillIndex:
+    """
+    A compiled index that finds every skill (and alias) in a text with a single
+    regex scan, instead of running one `re.search` per skill.
+
+    Matching follows the same rules as `re.search(r'\\b' + re.escape(skill) + r'\\b', text.lower())`:
+    it is case-insensitive, whole-word, and overlapping matches are all reported
+    (e.g. both 'sql' and 'microsoft sql server').
+    """
+
+    def __init__(self, skills, aliases=None):
+        # Canonical skills keep the order they were given in
+        self.skills = list(dict.fromkeys(skills))
+        self._order = {skill: i for i, skill in enumerate(self.skills)}
+
+        # Lowercase search term -> canonical skills it stands for
+        self._terms = {}
+        for skill in self.skills:
+            if skill:
+                self._terms.setdefault(skill.lower(), []).append(skill)
+
+        by_lower = {}
+        for skill in self.skills:
+            by_lower.setdefault(skill.lower(), []).append(skill)
+        for alias, canonical in (aliases or {}).items():
+            targets = by_lower.get(canonical.lower())
+            if alias and targets:
+                self._terms.setdefault(alias.lower(), [])
+                self._terms[alias.lower()].extend(t for t in targets if t not in self._terms[alias.lower()])
+
+        # Shorter terms that are prefixes of a longer term (and end on a word
+        # boundary inside it) match at the same position, so record them up front.
+        self._prefix_terms = {}
+        for term in self._terms:
+            self._prefix_terms[term] = [
+                term[:i] for i in range(1, len(term))
+                if term[:i] in self._terms
+                and _is_word_char(term[i - 1]) != _is_word_char(term[i])
+            ]
+
+        trie = {}
+        for term in self._terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[''] = True
+
+        # The lookahead lets overlapping terms at later positions still be found
+        self.pattern = re.compile(r'(?=(\b' + _trie_pattern(trie) + '))') if trie else None
+
+    def iter_matches(self, text):
+        """
+        Yields (skill, term, start, end) for every occurrence of a skill or alias.
+        Positions refer to the lowercased text.
+        """
+        if self.pattern is None:
+            return
+        for match in self.pattern.finditer(text.lower()):
+            term = match.group(1)
+            start = match.start(1)
+            seen = set()
+            for found in [term] + self._prefix_terms[term]:
+                for skill in self._terms[found]:
+                    # An alias and its canonical name can share a start position
+                    if skill not in seen:
+                        seen.add(skill)
+                        yield skill, found, start, start + len(found)
+
+    def positions(self, text):
+        """Returns {skill: [(start, end), ...]} for every skill present in the text."""
+        result = {}
+        for skill, _, start, end in self.iter_matches(text):
+            result.setdefault(skill, []).append((start, end))
+        return result
+
+    def count(self, text):
+        """Returns a Counter of how many times each skill occurs in the text."""
+        return Counter(skill for skill, _, _, _ in self.iter_matches(text))
+
+    def find(self, text):
+        """Returns the skills present in the text, in the order the index was built with."""
+        found = {skill for skill, _, _, _ in self.iter_matches(text)}
+        return sorted(found, key=self._order.__getitem__)
+
+
+@lru_cache(maxsize=64)
+def _cached_index(skills, aliases):
+    return SkillIndex(skills, dict(aliases))
+
+
+def get_skill_index(skills, aliases=None):
+    """Returns a shared SkillIndex for this skill list, compiling it only once."""
+    return _cached_index(tuple(skills), frozenset((aliases or {}).items()))
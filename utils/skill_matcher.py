@@ -1,11 +1,6 @@
-import re
+from utils.skill_extractor import SKILL_ALIASES
+from utils.skill_index import get_skill_index
 
 def match_skills_from_text(resume_text, jd_skills):
-    matched = []
-    resume_text = resume_text.lower()
-
-    for skill in jd_skills:
-        if re.search(r'\b' + re.escape(skill.lower()) + r'\b', resume_text):
-            matched.append(skill)
-
-    return matched
+    # The compiled index is cached per skill list, so repeated calls don't rebuild it
+    return get_skill_index(jd_skills, SKILL_ALIASES).find(resume_text)
\ No newline at end of file